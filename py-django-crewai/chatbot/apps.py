@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ChatbotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chatbot'
+
+    def ready(self):
+        import tmdbsimple as tmdb
+        from django.conf import settings
+
+        # tmdbsimple reads its API key from a module global; set it once at startup
+        # rather than from every manager instance
+        api_key = getattr(settings, 'TMDB_API_KEY', None)
+        if api_key:
+            tmdb.API_KEY = api_key
@@ -9,6 +9,7 @@ from .views import (
     get_movie_recommendations,
     poll_movie_recommendations,
     poll_first_run_recommendations,
+    stream_movie_recommendations,
     get_theaters,
     theater_status,
     reset_conversation,
@@ -7,17 +7,26 @@ Performance improvements:
 4. Reduced logging verbosity for production
 5. Added timeout handling for CrewAI tasks
 """
+import asyncio
+import copy
 import logging
-import json
-import re
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Union
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple, Union
 import concurrent.futures
 import time
+from time import perf_counter_ns
 import functools
-import tmdbsimple as tmdb
+import hashlib
+from collections import defaultdict
+from itertools import chain
+import threading
+import openai
 from crewai import Task, Crew
 from django.conf import settings
+from django.core.cache import cache
 from langchain_openai import ChatOpenAI
 
 from .agents.movie_finder_agent import MovieFinderAgent
@@ -28,34 +37,297 @@ from .tools.analyze_preferences_tool import AnalyzePreferencesTool
 from .tools.find_theaters_tool_optimized import FindTheatersToolOptimized as FindTheatersTool
 from .tools.enhance_images_tool import EnhanceMovieImagesTool
 from .utils.logging_middleware import LoggingMiddleware
-from .utils.json_parser import JsonParser
+from .utils.json_parser import JsonParser, _TRAILING_COMMA_RE
 from .utils.response_formatter import ResponseFormatter
 from .utils.custom_event_listener import CustomEventListener
+from .utils.movie_record import MovieRec
+from .utils.ttl_cache import BoundedTTLCache
+
+try:
+    from crewai.utilities.events.utils.console_formatter import ConsoleFormatter
+except ImportError:
+    ConsoleFormatter = None
+
+# litellm is checked once at import; _build_llm picks the config shape from this flag
+try:
+    import litellm
+    _HAS_LITELLM = True
+except ImportError:
+    _HAS_LITELLM = False
 
 # Get the logger
 logger = logging.getLogger('chatbot.movie_crew')
 
-# LLM Instance cache to avoid recreating instances
-LLM_CACHE = {}
+# Attributes probed, in order, for a task's raw output, and the "not present" marker
+_TASK_OUTPUT_ATTRS = ('raw', 'result', 'output')
+_SENTINEL = object()
+
+# Interned movie/theater keys used by the theater combine hot path
+_MOVIE_ID = sys.intern("movie_id")
+_MOVIE_TITLE = sys.intern("movie_title")
+_SHOWTIMES = sys.intern("showtimes")
+_THEATERS = sys.intern("theaters")
+
+# Timeout (seconds) for cached casual-mode recommendations, stored in the Django cache by query hash
+RECOMMENDATION_CACHE_TIMEOUT = 3600
 
 # Result cache for storing processed data
 RESULT_CACHE = {
-    'theaters': {},  # Cache theaters by movie_id
-    'recommendations': {}  # Cache recommendations by query hash
+    # Theaters from the latest search by (canonical movie ID, user location)
+    'theaters': BoundedTTLCache(max_size=512, ttl=3600, name="theater cache"),
+    # Enhanced First Run recommendations by query hash; only the theater search is re-run on a hit
+    'movie_lists': BoundedTTLCache(max_size=256, ttl=RECOMMENDATION_CACHE_TIMEOUT, name="movie list cache"),
 }
 
+# Theaters and showtime days/hours/minutes/formats used to generate fallback theater data
+_THEATER_TEMPLATES = (
+    {"name": "Cineplex Showcase", "address": "123 Main St", "distance_miles": 2.3},
+    {"name": "AMC Premiere", "address": "456 Broadway Ave", "distance_miles": 3.1},
+    {"name": "Regal Cinema City", "address": "789 Oak Drive", "distance_miles": 4.8},
+    {"name": "Landmark Theaters", "address": "101 Park Plaza", "distance_miles": 5.2},
+    {"name": "Century Cinemas", "address": "202 Grand Avenue", "distance_miles": 6.5},
+)
+_SHOWTIME_FORMATS = ("Standard", "IMAX", "3D", "Dolby Digital", "RPX")
+_SHOWTIME_DAY_OFFSETS = (timedelta(days=0), timedelta(days=1), timedelta(days=2))
+_SHOWTIME_HOURS = range(11, 23)
+_SHOWTIME_MINUTES = (0, 15, 30, 45)
+
+@functools.lru_cache(maxsize=1024)
+def _query_hash_cached(query, context):
+    """Memoized body of query_hash for a query and a tuple of context messages"""
+    # Hash incrementally with a separator per message instead of building a joined string
+    digest = hashlib.blake2b(query.encode('utf-8'), digest_size=16)
+    for content in context:
+        digest.update(b'\x00')
+        digest.update(content.encode('utf-8'))
+    return "movie_crew:recommendations:" + digest.hexdigest()
+
 def query_hash(query, conversation_history=None):
-    """Generate a simple hash for a query to use as cache key"""
+    """Generate a stable hash for a query (with recent context) to use as cache key"""
+    context = ()
     if conversation_history:
         # Only use the last 2 messages for context
-        context = [msg.get('content', '') for msg in conversation_history[-2:] if msg.get('content')]
-        query_with_context = query + ''.join(context)
-        return hash(query_with_context)
-    return hash(query)
+        context = tuple(msg.get('content', '') for msg in conversation_history[-2:] if msg.get('content'))
+    return _query_hash_cached(query, context)
+
+@functools.lru_cache(maxsize=1024)
+def _canon_id_cached(movie_id: Any) -> Optional[str]:
+    """Memoized body of _canon_id for hashable IDs"""
+    if movie_id is None or movie_id == '':
+        return None
+    try:
+        return str(int(movie_id))
+    except (TypeError, ValueError):
+        try:
+            return str(int(float(movie_id)))
+        except (TypeError, ValueError, OverflowError):
+            return str(movie_id).strip()
+
+def _canon_id(movie_id: Any) -> Optional[str]:
+    """Normalize a movie ID to a single string keyspace ("550", 550 and 550.0 all map to "550")"""
+    try:
+        return _canon_id_cached(movie_id)
+    except TypeError:
+        # Unhashable values can't be memoized
+        return str(movie_id)
+
+# Timeout (seconds) to wait for TMDb image enhancement after theater search,
+# further capped by what is left of the request deadline
+ENHANCEMENT_TIMEOUT = 30
+
+# Names of the tools created by the manager, registered with CrewAI event tracking once
+TOOL_NAMES = frozenset({
+    "search_movies_tool",
+    "analyze_preferences_tool",
+    "find_theaters_tool",
+    "enhance_movie_images_tool",
+})
+
+@functools.lru_cache(maxsize=16)
+@LoggingMiddleware.log_method_call
+def _build_llm(model, temperature, base_url, llm_provider, api_key, request_timeout):
+    """
+    Build a ChatOpenAI client, memoized on every parameter that affects it.
+
+    Args:
+        model: Model name, optionally prefixed with a provider ("openai/gpt-4o-mini")
+        temperature: Temperature parameter for the LLM
+        base_url: Optional custom endpoint URL for the LLM API
+        llm_provider: Optional explicit provider, overriding any model prefix
+        api_key: LLM API key
+        request_timeout: Per-request SDK timeout in seconds
+
+    Returns:
+        Configured ChatOpenAI instance
+    """
+    # Log configuration details
+    logger.info("Creating new LLM with model: %s", model)
+
+    # Extract model name and provider info
+    model_name = model
+    provider = llm_provider  # May be None if not specified
+
+    # Process provider/model format if present
+    if '/' in model_name:
+        parts = model_name.split('/', 1)
+        provider_from_name, model_without_prefix = parts
+
+        # If explicit provider was given, it overrides the prefix in the name
+        if not provider:
+            provider = provider_from_name
+            logger.info("Using provider from model name: %s", provider)
+
+        model_name = model_without_prefix
+        logger.info("Extracted model name without prefix: %s", model_name)
+
+    # If no provider specified yet, default to openai
+    if not provider:
+        provider = "openai"
+        logger.info("No provider specified, defaulting to: %s", provider)
+
+    # Ensure model always has provider prefix
+    full_model_name = f"{provider}/{model_name}"
+
+    # Create model mapping for LiteLLM - place it in model_kwargs
+    litellm_mapping = {model_name: provider}
+
+    # Set up model_kwargs with LiteLLM configuration
+    model_kwargs = {
+        "model_name_map": JsonParser.dumps(litellm_mapping)
+    }
+
+    # Use the litellm model mapping when litellm is available through langchain-openai's dependencies
+    if _HAS_LITELLM:
+        # Base configuration with the key as a parameter
+        config = {
+            "openai_api_key": api_key,
+            "model": full_model_name,
+            "temperature": temperature,
+            "model_kwargs": model_kwargs,
+            # Per-request limits for direct ChatOpenAI calls; crew runs are bounded by the kickoff deadline
+            "request_timeout": request_timeout,
+            "max_retries": 2
+        }
+    else:
+        logger.warning("litellm not available, using standard configuration")
+        # Use standard configuration without litellm mapping
+        config = {
+            "openai_api_key": api_key,
+            "model": model_name,  # Use just the model name without provider prefix
+            "temperature": temperature,
+            "request_timeout": request_timeout,
+            "max_retries": 2
+        }
+
+    # Add base URL if provided
+    if base_url:
+        config["openai_api_base"] = base_url
+
+    # Create the model instance with proper configuration
+    return ChatOpenAI(**config)
+
+@functools.lru_cache(maxsize=2)
+def _build_shared_tools(first_run_mode):
+    """
+    Build the search and analyze tools, memoized per mode.
+    These tools hold only the mode flag and no user data or thread pools, so concurrent
+    queries can share them (CrewAI's usage counter is never limited, max_usage_count is unset).
+
+    Args:
+        first_run_mode: Whether the search tool runs in First Run mode
+
+    Returns:
+        Tuple of (search tool, analyze tool)
+    """
+    # Create search tool with mode setting
+    search_tool = SearchMoviesTool()
+    search_tool.first_run_mode = first_run_mode
+
+    # Create analyze tool
+    analyze_tool = AnalyzePreferencesTool()
+
+    return search_tool, analyze_tool
+
+class _MovieKeys(NamedTuple):
+    """A movie record with the lookup keys the theater combine reads for it"""
+
+    movie: MovieRec
+    tmdb_id: Any
+    id_key: Optional[str]
+    title: Optional[str]
+
+class _TheaterIndex:
+    """Hash-join index of one request's theaters, keyed by ("id", canonical_id) and ("title", title)"""
+
+    __slots__ = ('_by_key', '_has_ids', '_has_titles')
+
+    def __init__(self):
+        # The tag keeps a numeric title such as "1917" from colliding with an ID
+        self._by_key: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        self._has_ids = False
+        self._has_titles = False
+
+    def add(self, theater: Dict[str, Any], movie_id: Optional[str], movie_title: Optional[str]) -> None:
+        """Index a theater under every key it can be matched by"""
+        if movie_id is not None:
+            self._by_key[("id", movie_id)].append(theater)
+            self._has_ids = True
+        if movie_title is not None:
+            self._by_key[("title", movie_title)].append(theater)
+            self._has_titles = True
+
+    def attach(self, keys: _MovieKeys) -> Tuple[int, int]:
+        """
+        Attach matching theaters to a single movie record.
+
+        Args:
+            keys: Record to update in place, with its lookup keys
+
+        Returns:
+            Tuple of (matched theaters, backfilled theater IDs); (0, 0) if theaters were already assigned
+        """
+        movie = keys.movie
+
+        # If the movie already has theaters assigned, use those
+        if movie.theaters:
+            return 0, 0
+
+        # Probe by ID and by title (.get avoids inserting into the defaultdict);
+        # index probes are skipped when nothing was indexed under that key type
+        id_matches = self._by_key.get(("id", keys.id_key), ()) if keys.id_key and self._has_ids else ()
+        title_matches = self._by_key.get(("title", keys.title), ()) if keys.title and self._has_titles else ()
+
+        # Title matches that carry a different movie's ID belong to that movie
+        if title_matches and keys.id_key:
+            title_matches = [
+                theater for theater in title_matches
+                if _canon_id(theater.get(_MOVIE_ID)) in (None, keys.id_key)
+            ]
+
+        # Merge both match sets; a theater indexed under both keys is kept once (by identity)
+        seen = set()
+        movie_theaters = [
+            theater for theater in chain(id_matches, title_matches)
+            if id(theater) not in seen and not seen.add(id(theater))
+        ]
+
+        # Update title-matched theaters with the movie ID for future reference (skip redundant stores)
+        backfilled_ids = 0
+        if title_matches and keys.tmdb_id:
+            for theater in title_matches:
+                if theater.get(_MOVIE_ID) != keys.tmdb_id:
+                    theater[_MOVIE_ID] = keys.tmdb_id
+                    backfilled_ids += 1
+
+        movie.theaters = movie_theaters
+        return len(movie_theaters), backfilled_ids
 
 class MovieCrewManagerOptimized:
     """Optimized Manager for the movie recommendation crew."""
 
+    # Guards the process-wide OPENAI_* environment variables shared by all managers
+    _llm_env_lock = threading.Lock()
+
     def __init__(
         self,
         api_key: str,
@@ -94,21 +366,41 @@ class MovieCrewManagerOptimized:
         self.timeout = timeout or 180  # Default timeout: 3 minutes if not specified
         self.fallback_enabled = False  # Disabled fallback to avoid generating fake data
 
-        # Configure TMDb API if key is provided
-        if tmdb_api_key:
-            tmdb.API_KEY = tmdb_api_key
+        # Resolve per-query settings once instead of on every request
+        self._max_recommendations = getattr(settings, 'MAX_RECOMMENDATIONS', 3)
+
+        # Export the LLM credentials for LiteLLM's underlying libraries (once, not per LLM build)
+        self.configure_llm_environment(api_key, base_url)
 
         # Configure thread pool for parallel processing
         self.executor = None
 
         # Log the initialization with timeout and fallback settings
-        logger.info(f"Initialized MovieCrewManagerOptimized with timeout={self.timeout}s, fallback_enabled={self.fallback_enabled}")
+        logger.info("Initialized MovieCrewManagerOptimized with timeout=%ss, fallback_enabled=%s", self.timeout, self.fallback_enabled)
+
+    @classmethod
+    def configure_llm_environment(cls, api_key: Optional[str], base_url: Optional[str] = None) -> None:
+        """
+        Set the OPENAI_* environment variables read by LiteLLM's underlying libraries.
+        Writes happen under a lock and only when a value changes.
+
+        Args:
+            api_key: LLM API key
+            base_url: Optional custom endpoint URL for the LLM API
+        """
+        if not api_key:
+            return
+
+        with cls._llm_env_lock:
+            if os.environ.get("OPENAI_API_KEY") != api_key:
+                os.environ["OPENAI_API_KEY"] = api_key
+            if base_url and os.environ.get("OPENAI_API_BASE") != base_url:
+                os.environ["OPENAI_API_BASE"] = base_url
 
-    @LoggingMiddleware.log_method_call
     def create_llm(self, temperature: float = 0.5) -> ChatOpenAI:
         """
         Create an LLM instance with the specified configuration.
-        Uses caching to avoid recreating instances.
+        Uses caching to avoid recreating instances; cache hits skip the logging middleware.
 
         Args:
             temperature: Temperature parameter for the LLM
@@ -116,96 +408,32 @@ class MovieCrewManagerOptimized:
         Returns:
             Configured ChatOpenAI instance
         """
-        # Create a cache key based on parameters
-        cache_key = f"{self.model}|{self.base_url}|{temperature}|{self.llm_provider}"
-
-        # Check if we already have this LLM in cache
-        if cache_key in LLM_CACHE:
-            logger.info(f"Using cached LLM instance for {self.model}")
-            return LLM_CACHE[cache_key]
-
-        # Log configuration details
-        logger.info(f"Creating new LLM with model: {self.model}")
-
-        # Extract model name and provider info
-        model_name = self.model
-        provider = self.llm_provider  # May be None if not specified
-
-        # Process provider/model format if present
-        if '/' in model_name:
-            parts = model_name.split('/', 1)
-            provider_from_name, model_without_prefix = parts
-
-            # If explicit provider was given, it overrides the prefix in the name
-            if not provider:
-                provider = provider_from_name
-                logger.info(f"Using provider from model name: {provider}")
-
-            model_name = model_without_prefix
-            logger.info(f"Extracted model name without prefix: {model_name}")
-
-        # If no provider specified yet, default to openai
-        if not provider:
-            provider = "openai"
-            logger.info(f"No provider specified, defaulting to: {provider}")
-
-        # Ensure model always has provider prefix
-        full_model_name = f"{provider}/{model_name}"
-
-        # Create model mapping for LiteLLM - place it in model_kwargs
-        litellm_mapping = {model_name: provider}
-
-        # Set up model_kwargs with LiteLLM configuration
-        model_kwargs = {
-            "model_name_map": json.dumps(litellm_mapping)
-        }
-
-        # Explicitly set the API key in the environment for LiteLLM's underlying libraries
-        import os
-        os.environ["OPENAI_API_KEY"] = self.api_key
-        if self.base_url:
-            os.environ["OPENAI_API_BASE"] = self.base_url
-
-        # Check if litellm is available through langchain-openai's dependencies
-        try:
-            import litellm
-
-            # Base configuration with the key as a parameter
-            config = {
-                "openai_api_key": self.api_key,
-                "model": full_model_name,
-                "temperature": temperature,
-                "model_kwargs": model_kwargs,
-                # Add timeout for better handling
-                "request_timeout": 120.0
-            }
-        except ImportError:
-            logger.warning("litellm not available, using standard configuration")
-            # Use standard configuration without litellm mapping
-            config = {
-                "openai_api_key": self.api_key,
-                "model": model_name,  # Use just the model name without provider prefix
-                "temperature": temperature,
-                "request_timeout": 120.0
-            }
-
-        # Add base URL if provided
-        if self.base_url:
-            config["openai_api_base"] = self.base_url
-
-        # Create the model instance with proper configuration
-        llm = ChatOpenAI(**config)
-
-        # Cache the instance for future use
-        LLM_CACHE[cache_key] = llm
-
-        return llm
+        # Instances are memoized by _build_llm's LRU cache; each of the ~3 LLM calls
+        # per query gets a third of the overall budget
+        return _build_llm(
+            self.model, temperature, self.base_url, self.llm_provider, self.api_key,
+            float(self.timeout) / 3
+        )
 
     def process_query(self, query: str, conversation_history: List[Dict[str, str]], first_run_mode: bool = True) -> Dict[str, Any]:
         """
         Process a user query and return movie recommendations.
         Optimized with caching, parallel processing, and timeouts.
 
+        Args:
+            query: The user's query
+            conversation_history: List of previous messages in the conversation
+            first_run_mode: Whether to operate in first run mode (with theaters)
+
+        Returns:
+            Dict with response text and movie recommendations
+        """
+        return self._run_query(query, conversation_history, first_run_mode)
+
+    def _run_query(self, query: str, conversation_history: List[Dict[str, str]], first_run_mode: bool) -> Dict[str, Any]:
+        """
+        Run the full recommendation pipeline for a query.
+
         Args:
             query: The user's query
             conversation_history: List of previous messages in the conversation
@@ -217,15 +445,23 @@ class MovieCrewManagerOptimized:
         # Check cache first for identical queries (with context)
         query_key = query_hash(query, conversation_history)
 
-        # Only use cache in casual mode as theaters/showtimes could change
-        if not first_run_mode and query_key in RESULT_CACHE['recommendations']:
-            logger.info(f"Using cached recommendation for query: {query}")
-            cached_result = RESULT_CACHE['recommendations'][query_key]
-            return cached_result
+        # Only use cached responses in casual mode as theaters/showtimes could change
+        if not first_run_mode:
+            cached_result = cache.get(query_key)
+            if cached_result is not None:
+                logger.info("Using cached recommendation for query: %s", query)
+                return cached_result
+
+        # In First Run mode a recent movie list is reused and only theaters/showtimes are refreshed
+        cached_movies = RESULT_CACHE['movie_lists'].get(query_key) if first_run_mode else None
+        if cached_movies is not None:
+            logger.info("Using cached movie list for query, refreshing theaters only: %s", query)
 
-        # Initialize executor if needed
+        # Every crew kickoff and the enhancement wait share one wall-clock budget for the request
+        deadline = time.monotonic() + self.timeout
+
+        # Initialize executor if needed (runs crew kickoffs under the deadline and overlaps image enhancement)
         if self.executor is None:
-            # Use ThreadPoolExecutor for handling parallel tasks
             self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
 
         # Create the LLM with error handling
@@ -234,9 +470,9 @@ class MovieCrewManagerOptimized:
             if not self.llm_instance:
                 self.llm_instance = self.create_llm()
             llm = self.llm_instance
-            logger.info(f"Using LLM instance: {self.model}")
+            logger.info("Using LLM instance: %s", self.model)
         except Exception as llm_error:
-            logger.error(f"Failed to create LLM instance: {str(llm_error)}")
+            logger.error("Failed to create LLM instance: %s", llm_error)
             logger.exception(llm_error)
             # Provide a fallback response
             return {
@@ -249,22 +485,26 @@ class MovieCrewManagerOptimized:
             # 1. Create tools with shared instances
             search_tool, analyze_tool, theater_finder_tool = self._create_tools(first_run_mode)
 
+            # Geocode the user in the background so the theater search finds the coordinates cached
+            if first_run_mode:
+                self.executor.submit(theater_finder_tool.prefetch_user_coordinates)
+
             # 2. Create agents with proper tools
             movie_finder, recommender, theater_finder = self._create_agents(
                 llm, search_tool, analyze_tool, theater_finder_tool
             )
 
             # 3. Set up tasks with proper timeouts and error handling
-            tasks = self._create_tasks(movie_finder, recommender, theater_finder, query)
+            tasks = self._create_tasks(movie_finder, recommender, theater_finder, query, first_run_mode)
 
-            # 4. Set up the crew based on mode
-            crew = self._create_crew(
-                movie_finder, recommender, theater_finder,
-                tasks, first_run_mode
+            # 4. Set up the recommendation crew (unless the movie list is cached), plus a theater crew in First Run mode
+            crew = self._create_crew(movie_finder, recommender, tasks) if cached_movies is None else None
+            theater_crew = (
+                self._create_theater_crew(theater_finder, tasks, cached_movies is None) if first_run_mode else None
             )
 
         except Exception as setup_error:
-            logger.error(f"Error during setup: {str(setup_error)}")
+            logger.error("Error during setup: %s", setup_error)
             logger.exception(setup_error)
             return {
                 "response": "I encountered a technical issue while setting up the recommendation system. Please try again.",
@@ -273,62 +513,55 @@ class MovieCrewManagerOptimized:
 
         # Execute the crew with enhanced error handling and timeout
         try:
-            # Add retry mechanism for crew execution
-            max_retries = 2
-            retry_count = 0
-            result = None
-
-            while retry_count <= max_retries:
-                try:
-                    start_time = datetime.now()
-
-                    # Use the configured timeout (or default)
-                    timeout_seconds = self.timeout
-                    logger.info(f"Using timeout of {timeout_seconds} seconds for crew execution")
-
-                    # Use a future to add timeout support
-                    future = self.executor.submit(crew.kickoff)
-                    result = future.result(timeout=timeout_seconds)
-
-                    end_time = datetime.now()
-                    execution_time = (end_time - start_time).total_seconds()
-                    logger.info(f"Crew execution completed in {execution_time:.2f} seconds")
-
-                    # Break out of retry loop if successful
-                    break
-
-                except concurrent.futures.TimeoutError:
-                    logger.error(f"Crew execution timed out after {timeout_seconds} seconds")
-                    retry_count += 1
-                    if retry_count > max_retries:
-                        raise TimeoutError(f"Crew execution timed out after {retry_count} attempts")
-                    logger.info(f"Retrying crew execution (attempt {retry_count}/{max_retries})")
-
-                except Exception as exec_error:
-                    logger.error(f"Error in crew execution: {str(exec_error)}")
-                    retry_count += 1
-                    if retry_count > max_retries:
-                        raise
-                    logger.info(f"Retrying crew execution (attempt {retry_count}/{max_retries})")
-
-            # Handle case where result is still None after retries
-            if result is None:
-                logger.warning("Crew execution returned None")
-                return {
-                    "response": f"I found some movie options for '{query}' but couldn't retrieve all the details. Here's what I can tell you.",
-                    "movies": []
-                }
-
-            # Process results efficiently with optimized methods
-            recommendations = self._process_recommendations(tasks[1])  # recommend_movies_task
+            if cached_movies is not None:
+                # Copy so the theater combine never mutates the cached list
+                recommendations = copy.deepcopy(cached_movies)
+            else:
+                result = self._kickoff_with_retries(crew, deadline)
+
+                # Handle case where result is still None after retries
+                if result is None:
+                    logger.warning("Crew execution returned None")
+                    return {
+                        "response": f"I found some movie options for '{query}' but couldn't retrieve all the details. Here's what I can tell you.",
+                        "movies": []
+                    }
+
+                # Process results efficiently with optimized methods
+                recommendations = self._process_recommendations(tasks[1])  # recommend_movies_task
+
+            # Skip the theater search entirely when no recommendation is a current release
+            if theater_crew is not None:
+                current_releases = self._current_releases(recommendations)
+                if current_releases:
+                    # Hand the tool the IDs and release dates, not just titles, so it can match and filter them
+                    tasks[2].description = (
+                        "Find theaters showing these movies near user location. Pass this JSON list to "
+                        "find_theaters_tool as movie_recommendations_json: "
+                        + JsonParser.dumps(current_releases)
+                    )
+                else:
+                    logger.info("No current releases recommended, skipping theater search")
+                    theater_crew = None
+
+            # Start image enhancement right away so it overlaps the theater search
+            phase_start_ns = perf_counter_ns()
+            enhancement_future = self.executor.submit(self._enhance_recommendations, recommendations)
+
+            # Find theaters (First Run mode only)
+            theaters_data = self._find_theaters(theater_crew, tasks[2], recommendations, deadline)
 
-            # Handle theaters in parallel for first run mode
-            theaters_data = []
-            if first_run_mode:
-                theaters_data = self._process_theaters(tasks[2], recommendations)  # find_theaters_task
+            try:
+                enhancement_wait = max(0.0, min(ENHANCEMENT_TIMEOUT, deadline - time.monotonic()))
+                recommendations = enhancement_future.result(timeout=enhancement_wait)
+            except Exception as enhance_error:
+                logger.error("Error enhancing recommendations: %s", enhance_error)
+            phase_duration = (perf_counter_ns() - phase_start_ns) / 1e9
+            logger.info("Theater search and enhancement completed in %.3f seconds", phase_duration)
 
-            # Filter and enhance recommendations
-            recommendations = self._enhance_recommendations(recommendations)
+            # Keep the enhanced movie list so a repeated First Run query only re-runs the theater search
+            if first_run_mode and cached_movies is None and recommendations:
+                RESULT_CACHE['movie_lists'].set(query_key, copy.deepcopy(recommendations))
 
             # Process and filter for current releases
             movies_with_theaters = self._prepare_final_movies(
@@ -349,14 +582,15 @@ class MovieCrewManagerOptimized:
                     "movies": movies_with_theaters
                 }
 
-            # Cache result for casual mode
+            # Cache result for casual mode; First Run responses are rebuilt from the cached
+            # movie list with fresh theaters instead
             if not first_run_mode:
-                RESULT_CACHE['recommendations'][query_key] = response
+                cache.set(query_key, response, timeout=RECOMMENDATION_CACHE_TIMEOUT)
 
             return response
 
         except Exception as e:
-            logger.error(f"Error processing query: {str(e)}")
+            logger.error("Error processing query: %s", e)
             logger.exception(e)
             return {
                 "response": "I apologize, but I encountered an error while searching for movies. Please try again with a different request.",
@@ -365,21 +599,14 @@ class MovieCrewManagerOptimized:
 
     def _create_tools(self, first_run_mode):
         """Create and configure tools with optimized settings"""
-        # Create search tool with mode setting
-        search_tool = SearchMoviesTool()
-        search_tool.first_run_mode = first_run_mode
-
-        # Create analyze tool
-        analyze_tool = AnalyzePreferencesTool()
+        # Stateless tools are shared across queries of the same mode
+        search_tool, analyze_tool = _build_shared_tools(first_run_mode)
 
-        # Create theater finder tool
+        # The theater finder carries the user's location and its own thread pool, so it is built per query
         theater_finder_tool = FindTheatersTool(user_location=self.user_location)
         theater_finder_tool.user_ip = self.user_ip
         theater_finder_tool.timezone = self.timezone
 
-        # Ensure tool compatibility
-        self._ensure_tool_compatibility([search_tool, analyze_tool, theater_finder_tool])
-
         return search_tool, analyze_tool, theater_finder_tool
 
     def _create_agents(self, llm, search_tool, analyze_tool, theater_finder_tool):
@@ -396,8 +623,23 @@ class MovieCrewManagerOptimized:
 
         return movie_finder, recommender, theater_finder
 
-    def _create_tasks(self, movie_finder, recommender, theater_finder, query):
+    def _create_tasks(self, movie_finder, recommender, theater_finder, query, first_run_mode=True):
         """Create tasks with optimized descriptions and expectations"""
+        # Max recommendations count is resolved from settings once in __init__
+        max_recommendations = self._max_recommendations
+
+        # In Casual Viewing mode, search and recommend in a single LLM round-trip
+        if not first_run_mode:
+            recommend_movies_task = Task(
+                description=(
+                    f"Find movies matching: '{query}', then recommend the top {max_recommendations} "
+                    "movies that best match preferences"
+                ),
+                expected_output="JSON list of recommended movies with title, overview, release date, TMDb ID and explanations",
+                agent=recommender
+            )
+            return [None, recommend_movies_task, None]
+
         # Simplify and clarify task descriptions for better agent focus
         find_movies_task = Task(
             description=f"Find movies matching: '{query}'",
@@ -405,9 +647,6 @@ class MovieCrewManagerOptimized:
             agent=movie_finder
         )
 
-        # Get max recommendations count from settings with default
-        max_recommendations = getattr(settings, 'MAX_RECOMMENDATIONS', 3)
-
         recommend_movies_task = Task(
             description=f"Recommend top {max_recommendations} movies that best match preferences",
             expected_output="JSON list of recommended movies with explanations",
@@ -422,66 +661,179 @@ class MovieCrewManagerOptimized:
 
         return [find_movies_task, recommend_movies_task, find_theaters_task]
 
-    def _create_crew(self, movie_finder, recommender, theater_finder, tasks, first_run_mode):
-        """Create and configure the crew based on mode"""
-        find_movies_task, recommend_movies_task, find_theaters_task = tasks
+    def _create_crew(self, movie_finder, recommender, tasks):
+        """Create the crew that finds and recommends movies"""
+        find_movies_task, recommend_movies_task, _ = tasks
 
         # Create custom event listener with optimized logging
         event_listener = CustomEventListener()
 
-        # Patch event tracking before crew creation
-        self._patch_crewai_event_tracking()
-
-        if first_run_mode:
-            # For First Run mode, include all agents and tasks
-            crew = Crew(
-                agents=[movie_finder, recommender, theater_finder],
-                tasks=[find_movies_task, recommend_movies_task, find_theaters_task],
-                verbose=False,  # Reduce verbosity for improved performance
-                event_listeners=[event_listener]
-            )
+        # Casual Viewing mode has a single combined search-and-recommend task
+        if find_movies_task is None:
+            agents = [recommender]
+            crew_tasks = [recommend_movies_task]
         else:
-            # For Casual Viewing mode, skip the theater finder
-            crew = Crew(
-                agents=[movie_finder, recommender],
-                tasks=[find_movies_task, recommend_movies_task],
-                verbose=False,  # Reduce verbosity for improved performance
-                event_listeners=[event_listener]
-            )
+            agents = [movie_finder, recommender]
+            crew_tasks = [find_movies_task, recommend_movies_task]
+
+        # Theater search runs in its own crew so it can overlap with image enhancement
+        crew = Crew(
+            agents=agents,
+            tasks=crew_tasks,
+            verbose=False,  # Reduce verbosity for improved performance
+            event_listeners=[event_listener]
+        )
 
         return crew
 
+    def _create_theater_crew(self, theater_finder, tasks, with_context=True):
+        """Create the First Run mode crew that finds theaters for the recommendations"""
+        _, recommend_movies_task, find_theaters_task = tasks
+
+        # Feed the completed recommendation task's output to the theater task; when the movie
+        # list comes from the cache that task never runs, so the description carries the movies alone
+        find_theaters_task.context = [recommend_movies_task] if with_context else []
+
+        return Crew(
+            agents=[theater_finder],
+            tasks=[find_theaters_task],
+            verbose=False,
+            event_listeners=[CustomEventListener()]
+        )
+
+    def _find_theaters(self, theater_crew, theater_task, recommendations, deadline):
+        """
+        Run the theater crew and parse its output.
+
+        Args:
+            theater_crew: Theater crew to run, or None in Casual Viewing mode
+            theater_task: The find_theaters task owned by theater_crew
+            recommendations: Parsed recommendations from the recommendation task
+            deadline: time.monotonic() value by which the whole request must finish
+
+        Returns:
+            List of theater data
+        """
+        if theater_crew is None:
+            return []
+
+        try:
+            self._kickoff_with_deadline(theater_crew, deadline)
+        except Exception as e:
+            logger.error("Error in theater crew execution: %s", e)
+            return []
+
+        return self._process_theaters(theater_task, recommendations)
+
+    def _kickoff_with_retries(self, crew: Crew, deadline: float) -> Any:
+        """
+        Run the recommendation crew, retrying failed executions within the request deadline.
+
+        Args:
+            crew: Crew to run
+            deadline: time.monotonic() value by which the whole request must finish
+
+        Returns:
+            Crew result, or None if the crew produced none
+
+        Raises:
+            TimeoutError: If the crew doesn't finish before the deadline
+        """
+        # Add retry mechanism for crew execution
+        max_retries = 2
+        retry_count = 0
+        result = None
+
+        while retry_count <= max_retries:
+            try:
+                start_ns = perf_counter_ns()
+
+                result = self._kickoff_with_deadline(crew, deadline)
+
+                execution_time = (perf_counter_ns() - start_ns) / 1e9
+                logger.info("Crew execution completed in %.2f seconds", execution_time)
+
+                # Break out of retry loop if successful
+                break
+
+            except TimeoutError:
+                # The overall budget is spent, so there is no time left to retry
+                logger.error("Crew execution timed out after %s seconds", self.timeout)
+                raise
+
+            except openai.APITimeoutError:
+                logger.error("Crew execution timed out waiting for the LLM")
+                retry_count += 1
+                if retry_count > max_retries:
+                    raise TimeoutError(f"Crew execution timed out after {retry_count} attempts")
+                logger.info("Retrying crew execution (attempt %d/%d)", retry_count, max_retries)
+
+            except Exception as exec_error:
+                logger.error("Error in crew execution: %s", exec_error)
+                retry_count += 1
+                if retry_count > max_retries:
+                    raise
+                logger.info("Retrying crew execution (attempt %d/%d)", retry_count, max_retries)
+
+        return result
+
+    def _kickoff_with_deadline(self, crew: Crew, deadline: float) -> Any:
+        """
+        Run a crew on the executor and wait for it until a monotonic deadline.
+        CrewAI's LLM calls don't inherit the ChatOpenAI client's timeouts, so the deadline is
+        enforced here; a crew that misses it can't be interrupted and finishes in the background.
+
+        Args:
+            crew: Crew to run
+            deadline: time.monotonic() value by which the crew must finish
+
+        Returns:
+            Crew result
+
+        Raises:
+            TimeoutError: If the deadline has passed or passes before the crew finishes
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("No time left for crew execution")
+
+        future = self.executor.submit(crew.kickoff)
+        try:
+            return future.result(timeout=remaining)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Crew execution did not finish within {remaining:.1f} seconds")
+
     def _process_recommendations(self, recommend_task):
         """Process and parse recommendation output with better error handling"""
         # Extract and parse recommendation output
         try:
             recommend_output = self._safe_extract_task_output(recommend_task, "Recommendation")
+            if not self._has_json_shape(recommend_output, "Recommendation"):
+                return []
             recommendations = JsonParser.parse_json_output(recommend_output)
-            return recommendations if recommendations else []
+            # Keep only movie dicts so downstream loops can skip per-item type checks
+            if not isinstance(recommendations, list):
+                return []
+            return [movie for movie in recommendations if isinstance(movie, dict)]
         except Exception as e:
-            logger.error(f"Error processing recommendations: {str(e)}")
+            logger.error("Error processing recommendations: %s", e)
             return []
 
     def _process_theaters(self, theater_task, recommendations):
-        """Process theater data with parallel processing and caching"""
+        """Process theater data; the combine step caches the theaters it matches"""
         try:
             # Extract theater output
             theater_output = self._safe_extract_task_output(theater_task, "Theater")
+            if not self._has_json_shape(theater_output, "Theater"):
+                return []
+
             theaters_data = JsonParser.parse_json_output(theater_output)
 
             # Apply manual JSON repair if parsing failed
             if not theaters_data and theater_output.startswith('[') and theater_output.endswith(']'):
                 theaters_data = self._repair_json(theater_output)
 
-            # Cache theaters by movie ID for future requests
-            if theaters_data:
-                for theater in theaters_data:
-                    if isinstance(theater, dict) and 'movie_id' in theater:
-                        movie_id = str(theater['movie_id'])
-                        if movie_id not in RESULT_CACHE['theaters']:
-                            RESULT_CACHE['theaters'][movie_id] = []
-                        RESULT_CACHE['theaters'][movie_id].append(theater)
-
             # Never use fallback theaters - even if no theaters found
             if not theaters_data:
                 logger.info("No theaters found, but fallback theater data generation is disabled")
@@ -489,7 +841,7 @@ class MovieCrewManagerOptimized:
 
             return theaters_data if theaters_data else []
         except Exception as e:
-            logger.error(f"Error processing theater data: {str(e)}")
+            logger.error("Error processing theater data: %s", e)
             return []
 
     def _enhance_recommendations(self, recommendations):
@@ -506,64 +858,68 @@ class MovieCrewManagerOptimized:
                 if 'tmdb_id' not in movie and 'id' in movie:
                     movie['tmdb_id'] = movie['id']
 
-            # Use the tool to enhance images (with timeout)
-            recommendations_json = json.dumps(recommendations)
-            enhanced_json = enhance_images_tool._run(recommendations_json)
-
-            # Parse and return enhanced data
-            enhanced_recommendations = JsonParser.parse_json_output(enhanced_json)
-            return enhanced_recommendations if enhanced_recommendations else recommendations
+            # Only movies missing a poster or backdrop need a TMDB round-trip
+            needs_enhance = [
+                index for index, movie in enumerate(recommendations)
+                if not (movie.get('poster_url') and movie.get('backdrop_url'))
+            ]
+            if not needs_enhance:
+                logger.info("All recommendations already have images, skipping enhancement")
+                return recommendations
+
+            # Enhance the parsed movies directly, fetching all movies concurrently
+            enhanced_subset = asyncio.run(
+                enhance_images_tool._arun_objects([recommendations[index] for index in needs_enhance])
+            )
+            if len(enhanced_subset) != len(needs_enhance):
+                return recommendations
+
+            # Splice enhanced movies back in their original positions
+            enhanced_recommendations = list(recommendations)
+            for index, movie in zip(needs_enhance, enhanced_subset):
+                enhanced_recommendations[index] = movie
+            return enhanced_recommendations
         except Exception as e:
-            logger.error(f"Error enhancing recommendations: {str(e)}")
+            logger.error("Error enhancing recommendations: %s", e)
             return recommendations
 
     def _prepare_final_movies(self, recommendations, theaters_data, first_run_mode):
         """Prepare final movie data with theaters for rendering"""
-        # Process current releases
-        self._process_current_releases(recommendations)
+        # Work on slotted records for the per-movie flags
+        records = [MovieRec.from_json(m) for m in recommendations if isinstance(m, dict)]
 
-        # Filter for current releases in first run mode
-        if first_run_mode:
-            current_movies = [m for m in recommendations if m.get('is_current_release', False)]
-            recommendations_to_use = current_movies if current_movies else recommendations
+        # Flag current releases and set the mode in a single pass
+        conversation_mode = 'first_run' if first_run_mode else 'casual'
+        current_movies = self._process_current_releases(records, conversation_mode)
 
-            # Set mode flag
-            for movie in recommendations_to_use:
-                movie['conversation_mode'] = 'first_run'
+        # Filter for current releases in first run mode
+        if first_run_mode and current_movies:
+            records_to_use = current_movies
         else:
-            recommendations_to_use = recommendations
-            # Set mode flag
-            for movie in recommendations_to_use:
-                movie['conversation_mode'] = 'casual'
+            records_to_use = records
 
         # Combine recommendations with theater data
-        movies_with_theaters = self._combine_movies_and_theaters(
-            recommendations_to_use, theaters_data
-        )
+        movies_with_theaters = self._combine_movies_and_theaters(records_to_use, theaters_data)
 
         return movies_with_theaters
 
     def _safe_extract_task_output(self, task, task_name):
         """Safely extract task output with better error handling"""
-        logger.debug(f"Extracting output from {task_name} task")
+        logger.debug("Extracting output from %s task", task_name)
 
-        if not hasattr(task, 'output'):
-            logger.error(f"{task_name} task has no 'output' attribute")
+        # A missing attribute and a None output are handled the same way
+        task_output = getattr(task, 'output', None)
+        if task_output is None:
+            logger.error("%s task has no output", task_name)
             return "[]"
 
-        if task.output is None:
-            logger.error(f"{task_name} task output is None")
-            return "[]"
-
-        # Try different approaches to get the raw output
-        if hasattr(task.output, 'raw'):
-            output = task.output.raw
-        elif hasattr(task.output, 'result'):
-            output = task.output.result
-        elif hasattr(task.output, 'output'):
-            output = task.output.output
+        # Take the first raw-output attribute present (one getattr per name, no hasattr probes)
+        for attr_name in _TASK_OUTPUT_ATTRS:
+            output = getattr(task_output, attr_name, _SENTINEL)
+            if output is not _SENTINEL:
+                break
         else:
-            output = str(task.output)
+            output = str(task_output)
 
         # Validate output is a string and has content
         if not isinstance(output, str):
@@ -571,156 +927,207 @@ class MovieCrewManagerOptimized:
 
         return output.strip() or "[]"
 
+    @staticmethod
+    def _has_json_shape(output: str, task_name: str) -> bool:
+        """
+        Cheaply check whether task output can contain JSON before running the parser.
+
+        Args:
+            output: Extracted task output
+            task_name: Task name used in log messages
+
+        Returns:
+            False for empty output or output without any array/object delimiter
+        """
+        if output == "[]":
+            logger.debug("%s task output is empty", task_name)
+            return False
+
+        # Fenced or prose-wrapped JSON is still handed to the parser, so a delimiter anywhere is enough
+        if '[' not in output and '{' not in output:
+            logger.debug("%s task output contains no JSON, skipping parse", task_name)
+            return False
+
+        return True
+
     def _repair_json(self, json_str):
         """Manually repair common JSON issues"""
         try:
-            # Replace trailing commas before closing brackets
-            fixed_json = re.sub(r',\s*}', '}', json_str)
-            fixed_json = re.sub(r',\s*]', ']', fixed_json)
+            # Replace trailing commas before closing braces and brackets in one pass
+            # (no comma means nothing to strip, so skip the scan)
+            fixed_json = _TRAILING_COMMA_RE.sub(r'\1', json_str) if ',' in json_str else json_str
 
-            # Try parsing with the fixed JSON
-            return json.loads(fixed_json)
+            # Try parsing with the fixed JSON (orjson when available)
+            return JsonParser.loads(fixed_json)
         except Exception:
             return []
 
-    def _process_current_releases(self, recommendations):
-        """Determine which movies are current releases"""
-        current_year = datetime.now().year
-
-        for movie in recommendations:
-            if not isinstance(movie, dict):
-                continue
+    def _process_current_releases(self, recommendations, conversation_mode):
+        """
+        Flag current releases and set the conversation mode in one pass.
 
-            # Parse release date to determine if it's a current movie
-            release_date = movie.get('release_date', '')
-            release_year = None
+        Args:
+            recommendations: List of MovieRec records (updated in place)
+            conversation_mode: Mode flag to set on every record
 
-            if release_date and len(release_date) >= 4:
-                try:
-                    release_year = int(release_date[:4])
-                except ValueError:
-                    pass
+        Returns:
+            List of the records that are current releases
+        """
+        # Movies from current year or previous year are considered "current"
+        threshold_year = datetime.now().year - 1
+        current_movies = []
 
-            # Movies from current year or previous year are considered "current"
-            is_current = release_year is not None and (release_year >= current_year - 1)
-            movie['is_current_release'] = is_current
+        for movie in recommendations:
+            is_current = self._is_current_year(movie.release_date, threshold_year)
+            movie.is_current_release = is_current
+            movie.conversation_mode = conversation_mode
 
-            # For older movies, set an empty theaters list to skip theater lookup
-            if not is_current:
-                movie['theaters'] = []
+            if is_current:
+                current_movies.append(movie)
+            elif movie.theaters is None:
+                # For older movies, set an empty theaters list to skip theater lookup (keep any existing one)
+                movie.theaters = []
 
-    def _combine_movies_and_theaters(self, recommendations, theaters_data):
-        """Combine movie recommendations with theater data efficiently"""
-        # Create lookup dictionaries for faster matching
-        theaters_by_movie_id = {}
-        theaters_by_movie_title = {}
+        return current_movies
 
-        # First check cache for any known theaters
-        for movie in recommendations:
-            if not isinstance(movie, dict):
-                continue
+    def _current_releases(self, recommendations):
+        """
+        Get the recommended movies that are current releases, trimmed to what the theater tool reads.
 
-            # Check if we have cached theaters for this movie
-            if 'tmdb_id' in movie:
-                movie_id = str(movie['tmdb_id'])
-                if movie_id in RESULT_CACHE['theaters']:
-                    # Use cached theaters
-                    theaters = RESULT_CACHE['theaters'][movie_id]
-                    if not hasattr(movie, 'theaters'):
-                        movie['theaters'] = []
-                    movie['theaters'].extend(theaters)
-                    logger.info(f"Using {len(theaters)} cached theaters for movie {movie.get('title')}")
+        Args:
+            recommendations: Parsed recommendation dicts (filtered to dicts by _process_recommendations)
 
-        # Process theaters from this request
-        for theater in theaters_data:
-            if not isinstance(theater, dict):
-                continue
+        Returns:
+            List of dicts with title, tmdb_id and release_date for each current release
+        """
+        threshold_year = datetime.now().year - 1
+        return [
+            {
+                'title': movie.get('title') or str(movie.get('tmdb_id') or movie.get('id')),
+                'tmdb_id': movie.get('tmdb_id') or movie.get('id'),
+                'release_date': movie.get('release_date'),
+            }
+            for movie in recommendations
+            if self._is_current_year(movie.get('release_date') or '', threshold_year)
+        ]
 
-            # Skip theaters without proper identification or showtimes
-            movie_id = theater.get("movie_id")
-            movie_title = theater.get("movie_title")
+    @staticmethod
+    def _is_current_year(release_date, threshold_year):
+        """Check the release year without raising on malformed dates"""
+        year_str = str(release_date)[:4]
+        return year_str.isdecimal() and int(year_str) >= threshold_year
 
-            if movie_id is None and movie_title is None:
-                continue
+    def _combine_movies_and_theaters(
+        self,
+        recommendations: List[MovieRec],
+        theaters_data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Combine movie records with theater data efficiently.
 
-            # Skip theaters without proper showtimes
-            if not theater.get("showtimes") or len(theater.get("showtimes", [])) == 0:
-                continue
+        Args:
+            recommendations: Slotted movie records (theaters are assigned in place)
+            theaters_data: Theater dicts from this request
 
-            # Add to ID-based lookup
-            if movie_id is not None:
-                movie_id_str = str(movie_id)
-                if movie_id_str not in theaters_by_movie_id:
-                    theaters_by_movie_id[movie_id_str] = []
-                theaters_by_movie_id[movie_id_str].append(theater)
+        Returns:
+            Movie dicts with theaters attached, ready for the API
+        """
+        # Single hash-join index over this request's theaters
+        theater_index = _TheaterIndex()
+
+        # Counters for a single summary log line instead of per-item logging
+        cached_movies = 0
+        cached_theaters = 0
+        skipped_no_id = 0
+        skipped_no_showtimes = 0
+
+        # Drop non-dict theater entries once up front so the loops below need no type checks
+        # (recommendations are already typed MovieRec records)
+        valid_theaters = [theater for theater in theaters_data if isinstance(theater, dict)]
+        skipped_invalid = len(theaters_data) - len(valid_theaters)
+        theaters_data = valid_theaters
+        if skipped_invalid:
+            logger.warning("Dropped %d non-dict theater entries before combining", skipped_invalid)
+
+        # Precompute each record's lookup keys once for both passes below (slot reads, no dict probes)
+        rec_keys = [
+            _MovieKeys(movie, movie.tmdb_id, _canon_id(movie.tmdb_id), movie.title or None)
+            for movie in recommendations
+        ]
 
-            # Add to title-based lookup
-            if movie_title is not None:
-                if movie_title not in theaters_by_movie_title:
-                    theaters_by_movie_title[movie_title] = []
-                theaters_by_movie_title[movie_title].append(theater)
+        # Only movies without theaters already assigned take new ones, so only their keys are worth indexing
+        # (the records passed in are already filtered to current releases in First Run mode)
+        wanted_ids = set()
+        wanted_titles = set()
+        for movie, _, movie_id, movie_title in rec_keys:
+            if not movie.theaters:
+                if movie_id is not None:
+                    wanted_ids.add(movie_id)
+                if movie_title is not None:
+                    wanted_titles.add(movie_title)
+        skipped_unmatched = 0
 
-        # Process each movie and add theaters
-        movies_with_theaters = []
+        # Process theaters from this request
+        for theater in theaters_data:
+            # Read each field once and validate against the bound locals
+            movie_id = _canon_id(theater.get(_MOVIE_ID))
+            movie_title = theater.get(_MOVIE_TITLE)
+            showtimes = theater.get(_SHOWTIMES)
 
-        for movie in recommendations:
-            if not isinstance(movie, dict):
+            if movie_id is None and movie_title is None:
+                skipped_no_id += 1
                 continue
 
-            # Get movie's TMDB ID and title
-            movie_tmdb_id = movie.get("tmdb_id") or movie.get("id")
-            movie_title = movie.get("title")
-
-            # Skip movies without ID or title
-            if not movie_tmdb_id and not movie_title:
+            # Skip theaters for movies that aren't being matched (no index inserts for them)
+            if movie_id not in wanted_ids and movie_title not in wanted_titles:
+                skipped_unmatched += 1
                 continue
 
-            # If the movie already has theaters assigned, use those
-            if 'theaters' in movie and movie['theaters']:
-                movies_with_theaters.append(movie)
+            # Skip theaters without proper showtimes
+            if not isinstance(showtimes, list) or not showtimes:
+                skipped_no_showtimes += 1
                 continue
 
-            # Look up theaters by ID first
-            movie_theaters = []
-            if movie_tmdb_id:
-                movie_id_str = str(movie_tmdb_id)
-                movie_theaters = theaters_by_movie_id.get(movie_id_str, [])
+            theater_index.add(theater, movie_id, movie_title)
 
-            # If no theaters found by ID, try matching by title
-            if not movie_theaters and movie_title:
-                movie_theaters = theaters_by_movie_title.get(movie_title, [])
+        # Records with an ID or title get theaters attached; the output lists are built by comprehension
+        attachable = [keys for keys in rec_keys if keys.tmdb_id or keys.title]
+        match_stats = [theater_index.attach(keys) for keys in attachable]
 
-                # Update theater data with the movie ID for future reference
-                if movie_theaters and movie_tmdb_id:
-                    for theater in movie_theaters:
-                        theater["movie_id"] = movie_tmdb_id
-
-            # Add theaters to the movie
-            movie_with_theaters = {**movie, "theaters": movie_theaters}
-            movies_with_theaters.append(movie_with_theaters)
+        # Fresh theaters replace the cached ones for this location; the cache only fills in
+        # movies this request found no theaters for
+        theater_cache = RESULT_CACHE[_THEATERS]
+        location_key = (self.user_location or "").strip().lower()
+        for (movie, _, movie_id, _), (matched, _) in zip(attachable, match_stats):
+            if movie_id is None:
+                continue
+            if matched:
+                theater_cache.set((movie_id, location_key), list(movie.theaters))
+            elif not movie.theaters:
+                theaters = theater_cache.get((movie_id, location_key))
+                if theaters:
+                    # Use a copy of the cached theaters
+                    movie.theaters = list(theaters)
+                    cached_movies += 1
+                    cached_theaters += len(theaters)
+
+        movies_with_theaters: List[Dict[str, Any]] = [keys.movie.to_json() for keys in attachable]
+
+        matched_movies = sum(1 for matched, _ in match_stats if matched)
+        matched_theaters = sum(matched for matched, _ in match_stats)
+        backfilled_ids = sum(backfilled for _, backfilled in match_stats)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Theater combination summary: cached_movies=%d, cached_theaters=%d, "
+                "matched_movies=%d, matched_theaters=%d, backfilled_ids=%d, "
+                "skipped_invalid=%d, skipped_no_id=%d, skipped_unmatched=%d, skipped_no_showtimes=%d",
+                cached_movies, cached_theaters, matched_movies, matched_theaters, backfilled_ids,
+                skipped_invalid, skipped_no_id, skipped_unmatched, skipped_no_showtimes
+            )
 
         return movies_with_theaters
 
-    def _ensure_tool_compatibility(self, tools):
-        """Ensure tools have necessary attributes for CrewAI compatibility"""
-        for tool in tools:
-            try:
-                # Make sure each tool has a name attribute
-                if not hasattr(tool, 'name'):
-                    tool_class_name = tool.__class__.__name__
-                    derived_name = tool_class_name.lower().replace('tool', '_tool')
-                    setattr(tool, 'name', derived_name)
-
-                # Pre-register tool with CrewAI event tracking
-                try:
-                    from crewai.utilities.events.utils.console_formatter import ConsoleFormatter
-                    if hasattr(ConsoleFormatter, 'tool_usage_counts') and tool.name not in ConsoleFormatter.tool_usage_counts:
-                        ConsoleFormatter.tool_usage_counts[tool.name] = 0
-                except (ImportError, AttributeError):
-                    pass
-            except Exception:
-                pass  # Continue even if tool compatibility check fails
-
     def _generate_fallback_theaters(self, recommendations):
         """
         Generate fallback theater data when real theater information can't be found.
@@ -738,70 +1145,47 @@ class MovieCrewManagerOptimized:
         if not recommendations:
             return []
 
-        # Current date and time for generating realistic showtimes
-        from datetime import datetime, timedelta
-        now = datetime.now()
-        current_date = now.date()
-
-        # Theater names and locations for fallback
-        theater_templates = [
-            {"name": "Cineplex Showcase", "address": "123 Main St", "distance_miles": 2.3},
-            {"name": "AMC Premiere", "address": "456 Broadway Ave", "distance_miles": 3.1},
-            {"name": "Regal Cinema City", "address": "789 Oak Drive", "distance_miles": 4.8},
-            {"name": "Landmark Theaters", "address": "101 Park Plaza", "distance_miles": 5.2},
-            {"name": "Century Cinemas", "address": "202 Grand Avenue", "distance_miles": 6.5}
+        # Keep current releases with a title and an ID, paired with that ID
+        eligible = [
+            (movie, movie_id)
+            for movie in recommendations
+            if isinstance(movie, dict) and 'title' in movie and movie.get('is_current_release', True)
+            for movie_id in (movie.get('tmdb_id') or movie.get('id'),)
+            if movie_id
         ]
+        if not eligible:
+            return []
 
-        # Formats for showtimes
-        formats = ["Standard", "IMAX", "3D", "Dolby Digital", "RPX"]
+        # ISO date prefixes for today and the next two days; only the time of day varies per showtime
+        now = datetime.now()
+        day_prefixes = tuple((now + day_offset).strftime("%Y-%m-%dT") for day_offset in _SHOWTIME_DAY_OFFSETS)
 
         # Generate theater data for each movie
         theaters_data = []
 
-        for movie in recommendations:
-            # Skip movies that don't have required fields
-            if not isinstance(movie, dict) or 'title' not in movie:
-                continue
-
-            movie_id = movie.get('tmdb_id') or movie.get('id')
+        for movie, movie_id in eligible:
             movie_title = movie.get('title')
 
-            # Skip non-current movies or movies without IDs
-            if not movie.get('is_current_release', True) or not movie_id:
-                continue
-
-            # Select 2-3 theaters for this movie
-            import random
-            num_theaters = min(len(theater_templates), random.randint(2, 3))
-            selected_theaters = random.sample(theater_templates, num_theaters)
+            # Select 2-3 theaters for this movie: sample three, then keep two half of the time
+            selected_theaters = random.sample(_THEATER_TEMPLATES, 3)
+            if random.random() < 0.5:
+                selected_theaters = selected_theaters[:2]
 
             for theater in selected_theaters:
-                # Generate 4-8 showtimes over the next 3 days
-                showtimes = []
+                # Generate 4-8 showtimes over the next 3 days, drawing each field for all of them at once
                 num_showtimes = random.randint(4, 8)
-
-                for _ in range(num_showtimes):
-                    # Random days ahead (0-2 days)
-                    days_ahead = random.randint(0, 2)
-                    # Random hour between 11 AM and 10 PM
-                    hour = random.randint(11, 22)
-                    # Random minute (0, 15, 30, 45)
-                    minute = random.choice([0, 15, 30, 45])
-
-                    showtime_dt = now.replace(
-                        hour=hour,
-                        minute=minute,
-                        second=0,
-                        microsecond=0
-                    ) + timedelta(days=days_ahead)
-
-                    # Format: randomly selected
-                    format_choice = random.choice(formats)
-
-                    showtimes.append({
-                        "start_time": showtime_dt.isoformat(),
+                showtimes = [
+                    {
+                        "start_time": f"{day_prefix}{hour:02d}:{minute:02d}:00",
                         "format": format_choice
-                    })
+                    }
+                    for day_prefix, hour, minute, format_choice in zip(
+                        random.choices(day_prefixes, k=num_showtimes),
+                        random.choices(_SHOWTIME_HOURS, k=num_showtimes),
+                        random.choices(_SHOWTIME_MINUTES, k=num_showtimes),
+                        random.choices(_SHOWTIME_FORMATS, k=num_showtimes)
+                    )
+                ]
 
                 # Add a complete theater entry
                 theaters_data.append({
@@ -814,28 +1198,27 @@ class MovieCrewManagerOptimized:
                     "is_fallback": True  # Mark as fallback data
                 })
 
-        logger.info(f"Generated {len(theaters_data)} fallback theaters")
+        logger.info("Generated %d fallback theaters", len(theaters_data))
         return theaters_data
 
-    def _patch_crewai_event_tracking(self):
-        """Apply minimal patch to prevent CrewAI event tracking errors"""
-        try:
-            # Only patch the console formatter to avoid key errors
-            try:
-                from crewai.utilities.events.utils.console_formatter import ConsoleFormatter
 
-                # Pre-register our common tools
-                tool_names = ["search_movies_tool", "analyze_preferences_tool", "find_theaters_tool"]
+def _install_crewai_patch():
+    """Apply minimal one-time patch to prevent CrewAI event tracking errors"""
+    if ConsoleFormatter is None or getattr(ConsoleFormatter, '_movie_crew_patched', False):
+        return
 
-                # Ensure tool_usage_counts dictionary exists
-                if not hasattr(ConsoleFormatter, 'tool_usage_counts'):
-                    ConsoleFormatter.tool_usage_counts = {}
+    try:
+        # Ensure tool_usage_counts dictionary exists
+        if not hasattr(ConsoleFormatter, 'tool_usage_counts'):
+            ConsoleFormatter.tool_usage_counts = {}
 
-                # Add tool names to the tracking dictionary
-                for tool_name in tool_names:
-                    if tool_name not in ConsoleFormatter.tool_usage_counts:
-                        ConsoleFormatter.tool_usage_counts[tool_name] = 0
-            except ImportError:
-                pass  # Skip if module not found
-        except Exception:
-            pass  # Ignore any patching errors and continue
+        # Pre-register our tools
+        for tool_name in TOOL_NAMES:
+            ConsoleFormatter.tool_usage_counts.setdefault(tool_name, 0)
+
+        ConsoleFormatter._movie_crew_patched = True
+    except Exception:
+        pass  # Ignore any patching errors and continue
+
+# Patch CrewAI once at import time rather than on every request
+_install_crewai_patch()
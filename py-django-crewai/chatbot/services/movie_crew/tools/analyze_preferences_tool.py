@@ -1,16 +1,24 @@
 """
 Tool for analyzing user preferences and recommending movies.
 """
-import json
+import heapq
 import logging
+from bisect import bisect_left
 from datetime import datetime
 from typing import List, Dict, Any, Union
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field, field_validator
 
+from ..utils.json_parser import JsonParser
+from ..utils.movie_ids import normalize_movie_ids
+
 # Get the logger
 logger = logging.getLogger('chatbot.movie_crew')
 
+# Recency score by movie age in years: <=1 -> 5, <=3 -> 4, <=5 -> 3, <=10 -> 2, older -> 1
+_RECENCY_AGE_LIMITS = (1, 3, 5, 10)
+_RECENCY_SCORES = (5, 4, 3, 2, 1)
+
 class AnalyzePreferencesInput(BaseModel):
     """Input schema for AnalyzePreferencesTool."""
     movies_json: Union[str, List[Dict[str, Any]], Dict[str, Any]] = Field(default="", description="JSON string containing movies to analyze")
@@ -21,15 +29,15 @@ class AnalyzePreferencesInput(BaseModel):
         if isinstance(v, dict):
             # Check if this is a dictionary with a nested 'movies_json' key - common LLM pattern
             if 'movies_json' in v and isinstance(v['movies_json'], (str, list, dict)):
-                return v['movies_json'] if isinstance(v['movies_json'], str) else json.dumps(v['movies_json'])
+                return v['movies_json'] if isinstance(v['movies_json'], str) else JsonParser.dumps(v['movies_json'])
             # Check for other common structures
             if 'movies' in v and isinstance(v['movies'], (list, dict)):
-                return json.dumps(v['movies'])
+                return JsonParser.dumps(v['movies'])
             # Default to JSON conversion of the entire dict
-            return json.dumps(v)
+            return JsonParser.dumps(v)
         elif isinstance(v, list):
             # Convert list directly to JSON string
-            return json.dumps(v)
+            return JsonParser.dumps(v)
         return v
 
 class AnalyzePreferencesTool(BaseTool):
@@ -57,67 +65,46 @@ class AnalyzePreferencesTool(BaseTool):
                     if isinstance(movies_json['movies_json'], str):
                         movies_json = movies_json['movies_json']
                     else:
-                        movies_json = json.dumps(movies_json['movies_json'])
+                        movies_json = JsonParser.dumps(movies_json['movies_json'])
                 # Check for other common structures
                 elif 'movies' in movies_json and isinstance(movies_json['movies'], (list, dict)):
-                    movies_json = json.dumps(movies_json['movies'])
+                    movies_json = JsonParser.dumps(movies_json['movies'])
                 else:
                     # Default to JSON conversion of the entire dict
-                    movies_json = json.dumps(movies_json)
+                    movies_json = JsonParser.dumps(movies_json)
             elif isinstance(movies_json, list):
                 # Convert list directly to JSON string
-                movies_json = json.dumps(movies_json)
+                movies_json = JsonParser.dumps(movies_json)
 
             # Default to empty list if the input is empty
             if not movies_json:
                 movies_json = "[]"
 
             # Parse the input JSON
-            movies = json.loads(movies_json)
+            movies = JsonParser.loads_movies(movies_json)
 
             if not movies:
                 logger.warning("No movies to recommend")
-                return json.dumps([])  # Return empty list if no movies to recommend
+                return JsonParser.dumps([])  # Return empty list if no movies to recommend
 
-            # Create better explanations based on movie details
-            recommendations = []
             max_recommendations = min(3, len(movies))
 
             # Sort movies by recency and rating
             # First try to prioritize movies with both high rating and recent release date
             today = datetime.now()
-            scored_movies = []
-
-            for movie in movies:
-                # Calculate score based on multiple factors
-                score = self._calculate_movie_score(movie, today)
-                scored_movies.append((movie, score))
-
-            # Sort by score in descending order
-            scored_movies.sort(key=lambda x: x[1], reverse=True)
-
-            # Get top movies
-            for movie, score in scored_movies[:max_recommendations]:
-                # Ensure movie has both tmdb_id and id for compatibility
-                if 'id' in movie and not 'tmdb_id' in movie:
-                    movie['tmdb_id'] = movie['id']
-                    logger.info(f"Set tmdb_id from id for movie: {movie.get('title')}")
-                elif 'tmdb_id' in movie and not 'id' in movie:
-                    movie['id'] = movie['tmdb_id']
-                    logger.info(f"Set id from tmdb_id for movie: {movie.get('title')}")
-
-                # Add TMDB URL if missing
-                if 'tmdb_id' in movie and not 'tmdb_url' in movie:
-                    movie['tmdb_url'] = f"https://www.themoviedb.org/movie/{movie['tmdb_id']}"
-                    logger.info(f"Added TMDB URL for movie: {movie.get('title')}")
-
-                # Include all original movie details in the recommendation
-                recommendations.append(movie)
-
-            return json.dumps(recommendations)
+
+            # Select the top movies by score without sorting the whole list (ties keep input order)
+            top_movies = heapq.nlargest(
+                max_recommendations, movies, key=lambda movie: self._calculate_movie_score(movie, today)
+            )
+
+            # Ensure the recommended movies have both tmdb_id and id, plus a TMDB URL
+            normalize_movie_ids(top_movies)
+
+            return JsonParser.dumps(top_movies)
         except Exception as e:
             logger.error(f"Error analyzing user preferences: {str(e)}")
-            return json.dumps([])
+            return JsonParser.dumps([])
 
     def _calculate_movie_score(self, movie: Dict[str, Any], today: datetime) -> float:
         """
@@ -133,11 +120,11 @@ class AnalyzePreferencesTool(BaseTool):
         # Get release year if available
         release_year = None
         release_date = movie.get('release_date', '')
-        if release_date and len(release_date) >= 4:
-            try:
-                release_year = int(release_date[:4])
-            except ValueError:
-                pass
+        if release_date:
+            # Check the digits up front instead of raising ValueError for malformed dates
+            head = release_date[:4]
+            if len(head) == 4 and head.isdecimal():
+                release_year = int(head)
 
         # Get rating if available
         rating = movie.get('rating', 0) or 0
@@ -145,18 +132,8 @@ class AnalyzePreferencesTool(BaseTool):
         # Calculate a score based on recency and rating
         recency_score = 0
         if release_year:
-            years_old = today.year - release_year
             # Recent movies get higher scores
-            if years_old <= 1:
-                recency_score = 5
-            elif years_old <= 3:
-                recency_score = 4
-            elif years_old <= 5:
-                recency_score = 3
-            elif years_old <= 10:
-                recency_score = 2
-            else:
-                recency_score = 1
+            recency_score = _RECENCY_SCORES[bisect_left(_RECENCY_AGE_LIMITS, today.year - release_year)]
 
         # Calculate total score (rating * recency)
         total_score = (rating / 2) + recency_score  # Normalize rating to 0-5 range
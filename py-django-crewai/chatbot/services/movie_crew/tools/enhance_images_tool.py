@@ -1,18 +1,29 @@
 """
 Tool for enhancing movie images using TMDB API.
 """
-import json
+import asyncio
 import logging
-from typing import Dict, List, Any, Union
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Tuple, Union
+import httpx
 import tmdbsimple as tmdb
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field, field_validator
 
 from ...tmdb_service import TMDBService
+from ..utils.json_parser import JsonParser
+from ..utils.movie_ids import normalize_movie_ids
+from ..utils.ttl_cache import BoundedTTLCache
 
 # Get the logger
 logger = logging.getLogger('chatbot.movie_crew')
 
+# Fields TMDB enhancement adds, cached per tmdb_id so popular movies aren't re-fetched on every request
+_ENHANCED_FIELDS = ('poster_url', 'backdrop_url', 'genres', 'rating', 'tagline', 'runtime', 'vote_count',
+                    'status', 'homepage', 'poster_urls', 'all_posters')
+_ENHANCE_CACHE = BoundedTTLCache(max_size=2048, ttl=3600, name="enhancement cache")
+
 class EnhanceMoviesInput(BaseModel):
     """Input schema for EnhanceMovieImagesTool."""
     movies_json: Union[str, List[Dict[str, Any]], Dict[str, Any]] = Field(default="", description="JSON string containing movies to enhance with better images")
@@ -21,7 +32,7 @@ class EnhanceMoviesInput(BaseModel):
     def validate_movies_json(cls, v):
         """Convert dictionaries or lists to string if needed."""
         if isinstance(v, (list, dict)):
-            return json.dumps(v)
+            return JsonParser.dumps(v)
         return v
 
 class EnhanceMovieImagesTool(BaseTool):
@@ -42,62 +53,174 @@ class EnhanceMovieImagesTool(BaseTool):
         Returns:
             JSON string containing enhanced movie data
         """
+        try:
+            movies = self._load_movies(movies_json)
+        except Exception as e:
+            logger.error("Error parsing movies to enhance: %s", e)
+            return movies_json  # Return original data on error
+
+        return JsonParser.dumps(self._run_objects(movies))
+
+    async def _arun(self, movies_json: Union[str, List[Dict[str, Any]], Dict[str, Any]] = "") -> str:
+        """
+        Enhance movie data with high-quality images, fetching all movies concurrently.
+
+        Args:
+            movies_json: JSON string containing movie recommendations
+
+        Returns:
+            JSON string containing enhanced movie data
+        """
+        try:
+            movies = self._load_movies(movies_json)
+        except Exception as e:
+            logger.error("Error parsing movies to enhance: %s", e)
+            return movies_json  # Return original data on error
+
+        return JsonParser.dumps(await self._arun_objects(movies))
+
+    def _run_objects(self, movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enhance already-parsed movies with high-quality images.
+
+        Args:
+            movies: List of movie dictionaries
+
+        Returns:
+            List of enhanced movie dictionaries
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop in this thread: fetch every movie concurrently over one pooled client
+            return asyncio.run(self._arun_objects(movies))
+
+        # Called from inside an event loop, which asyncio.run can't nest; run ours on a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._arun_objects(movies)).result()
+
+    async def _arun_objects(self, movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enhance already-parsed movies concurrently on the running event loop.
+
+        Args:
+            movies: List of movie dictionaries
+
+        Returns:
+            List of enhanced movie dictionaries
+        """
         # Start time for performance monitoring
-        import time
         start_time = time.time()
 
+        if not movies:
+            logger.warning("No movies to enhance")
+            return []
+
+        logger.info("Enhancing %d movies concurrently", len(movies))
+        # This is critical because sometimes the field may be 'id' instead of 'tmdb_id'
+        missing_ids = normalize_movie_ids(movies)
+        if missing_ids:
+            logger.warning("%d movies have no TMDB ID and cannot be enhanced", missing_ids)
+
+        if not self.tmdb_api_key:
+            logger.warning("No TMDB API key provided, skipping enhancement")
+            return movies
+
         try:
-            # Convert non-string inputs to JSON strings
-            if isinstance(movies_json, (list, dict)):
-                movies_json = json.dumps(movies_json)
-
-            # Parse input JSON
-            movies = json.loads(movies_json)
-            if not movies:
-                logger.warning("No movies to enhance")
-                return "[]"
-
-            logger.info(f"Enhancing {len(movies)} movies sequentially")
-
-            # Ensure every movie has a tmdb_id field for proper enhancement
-            # This is critical because sometimes the field may be 'id' instead of 'tmdb_id'
-            for movie in movies:
-                if not movie.get('tmdb_id') and movie.get('id'):
-                    movie['tmdb_id'] = movie['id']
-                    logger.info(f"Fixed TMDB ID for movie {movie.get('title')} - copied from 'id' field")
-                elif not movie.get('tmdb_id') and not movie.get('id'):
-                    # If neither field exists, log a warning
-                    logger.warning(f"Movie {movie.get('title')} has no TMDB ID and cannot be enhanced")
-
-            # Initialize TMDB service if needed
-            if not self.tmdb_api_key:
-                logger.warning("No TMDB API key provided, skipping enhancement")
-                return json.dumps(movies)
-
-            tmdb_service = TMDBService(api_key=self.tmdb_api_key)
-
-            # Use parallel enhancement for better performance
-            enhanced_movies = tmdb_service.enhance_movies_parallel(movies, max_workers=3)
-
-            # Ensure all enhanced movies retain their TMDB ID and poster info
-            for i, movie in enumerate(enhanced_movies):
-                # Triple-check that we have a tmdb_id field
-                if not movie.get('tmdb_id') and movie.get('id'):
-                    movie['tmdb_id'] = movie['id']
-                    logger.info(f"Post-enhancement: Fixed TMDB ID for movie {movie.get('title')}")
-
-                # Ensure we have a poster URL, even if it's a placeholder
-                if not movie.get('poster_url'):
-                    logger.warning(f"Missing poster URL for {movie.get('title')} after enhancement")
-                    movie['poster_url'] = f"https://via.placeholder.com/300x450?text={movie.get('title', 'Movie')}"
-
-            # End time
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-            logger.info(f"Enhanced {len(enhanced_movies)} movies in {elapsed_time:.2f} seconds")
-
-            return json.dumps(enhanced_movies)
+            enhanced_movies, misses = self._apply_cached_enhancements(movies)
+            if misses:
+                tmdb_service = TMDBService(api_key=self.tmdb_api_key)
+
+                # One pooled client for every TMDB request in this call
+                async with httpx.AsyncClient(timeout=10.0) as client:
+                    fetched = await tmdb_service.enhance_movies_async([movies[i] for i in misses], client=client)
+                self._store_enhancements(movies, enhanced_movies, misses, fetched)
+            self._finalize_movies(enhanced_movies)
+
+            elapsed_time = time.time() - start_time
+            logger.info("Enhanced %d movies in %.2f seconds", len(enhanced_movies), elapsed_time)
+
+            return enhanced_movies
         except Exception as e:
-            logger.error(f"Error enhancing movies with images: {str(e)}")
+            logger.error("Error enhancing movies with images: %s", e)
             logger.exception(e)
-            return movies_json  # Return original data on error
+            return movies  # Return original data on error
+
+    def _load_movies(self, movies_json: Union[str, List[Dict[str, Any]], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Parse the input movies.
+
+        Args:
+            movies_json: JSON string, list or dict containing movies
+
+        Returns:
+            List of movie dictionaries
+        """
+        # Accept already-parsed input without a JSON round-trip
+        if isinstance(movies_json, list):
+            return movies_json
+        if isinstance(movies_json, dict):
+            return [movies_json]
+
+        # Parse input JSON (the parse is shared with other tools receiving the same payload)
+        return JsonParser.loads_movies(movies_json) if movies_json else []
+
+    def _apply_cached_enhancements(self, movies: List[Dict[str, Any]]) -> Tuple[List[Any], List[int]]:
+        """
+        Enhance movies whose TMDB fields are already cached.
+
+        Args:
+            movies: List of movie dictionaries
+
+        Returns:
+            Tuple of the enhanced movies (None where the cache missed) and the indexes still to fetch
+        """
+        enhanced_movies = []
+        misses = []
+        for index, movie in enumerate(movies):
+            cached_fields = _ENHANCE_CACHE.get(movie.get('tmdb_id'))
+            if cached_fields is None:
+                enhanced_movies.append(None)
+                misses.append(index)
+            else:
+                enhanced_movies.append({**movie, **cached_fields})
+
+        if len(misses) < len(movies):
+            logger.info("Using cached enhancements for %d of %d movies", len(movies) - len(misses), len(movies))
+        return enhanced_movies, misses
+
+    def _store_enhancements(self, movies: List[Dict[str, Any]], enhanced_movies: List[Any],
+                            misses: List[int], fetched: List[Dict[str, Any]]) -> None:
+        """
+        Place freshly enhanced movies into the results and cache their TMDB fields.
+
+        Args:
+            movies: Original list of movie dictionaries
+            enhanced_movies: Results from _apply_cached_enhancements (updated in place)
+            misses: Indexes of the movies that were fetched
+            fetched: Enhanced movies for those indexes, in the same order
+        """
+        for index, enhanced in zip(misses, fetched):
+            enhanced_movies[index] = enhanced
+            tmdb_id = enhanced.get('tmdb_id')
+            fields = {field: enhanced[field] for field in _ENHANCED_FIELDS if field in enhanced}
+
+            # A failed enhancement returns the movie unchanged; only cache real TMDB data
+            original = movies[index]
+            if tmdb_id and any(original.get(field) != value for field, value in fields.items()):
+                _ENHANCE_CACHE.set(tmdb_id, fields)
+
+    def _finalize_movies(self, enhanced_movies: List[Dict[str, Any]]) -> None:
+        """
+        Ensure enhanced movies have a poster URL.
+
+        Args:
+            enhanced_movies: List of enhanced movie dictionaries (updated in place)
+        """
+        for movie in enhanced_movies:
+            title = movie.get('title')
+
+            # Ensure we have a poster URL, even if it's a placeholder
+            if not movie.get('poster_url'):
+                logger.warning("Missing poster URL for %s after enhancement", title)
+                movie['poster_url'] = f"https://via.placeholder.com/300x450?text={title or 'Movie'}"
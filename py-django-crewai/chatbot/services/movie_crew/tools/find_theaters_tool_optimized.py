@@ -7,12 +7,15 @@ Performance improvements:
 4. Reduced API calls with smarter batching
 """
 
-import json
+import functools
+import heapq
 import logging
 import time
 import concurrent.futures
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Union
+from itertools import islice
+from operator import itemgetter
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 from pydantic import BaseModel, Field, field_validator
 from django.conf import settings
 from crewai.tools import BaseTool
@@ -21,16 +24,55 @@ from ...location_service import LocationService
 from ...serp_service import SerpShowtimeService
 from ...api_utils import APIRequestHandler
 from ..utils.json_parser_optimized import JsonParserOptimized
+from ..utils.json_parser import JsonParser
+from ..utils.ttl_cache import BoundedTTLCache
 
 # Get the logger
 logger = logging.getLogger('chatbot.movie_crew')
 
-# Cache for theater data
+# Cache for theater data, keyed by (movie ID or title, normalized location); showtimes go stale within hours
 THEATER_CACHE = {
-    'by_movie_id': {},  # Cache theaters by movie ID and location
-    'by_movie_title': {}  # Cache theaters by movie title and location
+    'by_movie_id': BoundedTTLCache(max_size=512, ttl=3600, name="theater by movie ID cache"),
+    'by_movie_title': BoundedTTLCache(max_size=512, ttl=3600, name="theater by movie title cache")
 }
 
+# Resolved user coordinates keyed by (normalized location, user IP)
+COORDINATE_CACHE = BoundedTTLCache(max_size=512, ttl=86400, name="coordinate cache")
+
+@functools.lru_cache(maxsize=4)
+def _get_showtime_service(api_key: Optional[str]) -> Optional[SerpShowtimeService]:
+    """Shared SerpAPI showtime service for an API key, or None if the key isn't usable"""
+    if not api_key or api_key == 'your_serpapi_key_here':
+        return None
+    return SerpShowtimeService(api_key=api_key)
+
+def _distance_sort_key(theater: Dict[str, Any]) -> float:
+    """Sort key ordering theaters by distance, with unknown distances last"""
+    distance_miles = theater.get('distance_miles')
+    return distance_miles if distance_miles is not None else float('inf')
+
+# Common movie theater chains used for fallback theater data
+_FALLBACK_THEATER_TEMPLATES = (
+    {
+        "name": "AMC Theaters",
+        "address": "123 Main St, Seattle, WA 98101",
+        "distance_miles": 8.3,
+        "link": "https://www.amctheatres.com"
+    },
+    {
+        "name": "Regal Cinemas",
+        "address": "456 Pine Ave, Bellevue, WA 98004",
+        "distance_miles": 10.5,
+        "link": "https://www.regmovies.com"
+    },
+    {
+        "name": "Cinemark Theaters",
+        "address": "789 Oak Blvd, Redmond, WA 98052",
+        "distance_miles": 12.2,
+        "link": "https://www.cinemark.com"
+    },
+)
+
 class FindTheatersInput(BaseModel):
     """Input schema for FindTheatersTool."""
     movie_recommendations_json: Union[str, List[Dict[str, Any]], Dict[str, Any]] = Field(default="", description="JSON string containing movie recommendations")
@@ -39,7 +81,7 @@ class FindTheatersInput(BaseModel):
     def validate_movie_recommendations_json(cls, v):
         """Convert dictionaries or lists to string if needed."""
         if isinstance(v, (list, dict)):
-            return json.dumps(v)
+            return JsonParser.dumps(v)
         return v
 
 class FindTheatersToolOptimized(BaseTool):
@@ -63,7 +105,9 @@ class FindTheatersToolOptimized(BaseTool):
     def _init_thread_pool(self):
         """Initialize the thread pool if needed"""
         if self._thread_pool is None:
-            self._thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+            # One worker per processed movie so every showtime search is in flight at once
+            max_workers = max(4, getattr(settings, 'MAX_RECOMMENDATIONS', 3))
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
 
     def _run(self, movie_recommendations_json: Union[str, List[Dict[str, Any]], Dict[str, Any]] = "") -> str:
         """
@@ -79,26 +123,23 @@ class FindTheatersToolOptimized(BaseTool):
         start_time = time.time()
 
         try:
-            # Parse the input JSON
-            if isinstance(movie_recommendations_json, (list, dict)):
-                movie_recommendations = movie_recommendations_json
-            else:
-                movie_recommendations = JsonParserOptimized.parse_json_output(movie_recommendations_json) or []
+            # Without a usable SerpAPI key there is nothing to search; skip parsing and geocoding
+            showtime_service = _get_showtime_service(getattr(settings, 'SERPAPI_API_KEY', None))
+            if showtime_service is None:
+                logger.warning("No valid SerpAPI key configured, skipping theater search")
+                return JsonParser.dumps([])
+
+            # Get the max movies to process from settings - use configured value without hardcoded limit
+            max_movies = getattr(settings, 'MAX_RECOMMENDATIONS', 3)  # Use the configured value without restriction
+
+            # Parse the input and take the first max_movies current releases
+            movies_to_process = self._select_movies(movie_recommendations_json, max_movies)
 
             # Get location service with minimal initialization
             location_service = LocationService(user_agent="movie_chatbot_theaters")
 
             # Get user coordinates efficiently
             user_coords = self._get_user_coordinates(location_service)
-
-            # Get the max movies to process from settings - use configured value without hardcoded limit
-            max_movies = getattr(settings, 'MAX_RECOMMENDATIONS', 3)  # Use the configured value without restriction
-
-            # Filter for current releases only
-            current_movies = self._filter_current_releases(movie_recommendations)
-
-            # Limit to max_movies for processing
-            movies_to_process = current_movies[:max_movies]
             logger.info(f"Processing theater data for {len(movies_to_process)} movies")
 
             # Set a global timeout for theater search
@@ -109,7 +150,9 @@ class FindTheatersToolOptimized(BaseTool):
             try:
                 # Process theaters for each movie in parallel with timeout
                 from concurrent.futures import TimeoutError
-                theater_results = self._process_theaters_parallel(movies_to_process, user_coords, global_timeout)
+                theater_results = self._process_theaters_parallel(
+                    movies_to_process, user_coords, showtime_service, global_timeout
+                )
             except TimeoutError:
                 logger.warning(f"Global timeout reached after {global_timeout}s, returning partial results")
 
@@ -127,45 +170,60 @@ class FindTheatersToolOptimized(BaseTool):
             processing_time = time.time() - start_time
             logger.info(f"Theater processing completed in {processing_time:.2f} seconds")
 
-            return json.dumps(theater_results)
+            return JsonParser.dumps(theater_results)
 
         except Exception as e:
             logger.error(f"Error finding theaters: {str(e)}")
-            return json.dumps([])
+            return JsonParser.dumps([])
 
-    def _filter_current_releases(self, movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Filter to only include current releases"""
-        current_year = datetime.now().year
+    def _select_movies(self, movie_recommendations_json: Union[str, List[Dict[str, Any]], Dict[str, Any]],
+                       max_movies: int) -> List[Dict[str, Any]]:
+        """
+        Parse the recommendations and take the first current releases.
 
-        current_releases = []
-        for movie in movies:
-            # Movies must have a title and ID
-            if not isinstance(movie, dict) or 'title' not in movie:
-                continue
+        Args:
+            movie_recommendations_json: JSON string, list or dict of movie recommendations
+            max_movies: Maximum number of movies to return
 
-            # Ensure movie has a tmdb_id
-            if 'tmdb_id' not in movie and 'id' in movie:
-                movie['tmdb_id'] = movie['id']
+        Returns:
+            Up to max_movies current releases, in input order
+        """
+        if isinstance(movie_recommendations_json, (list, dict)):
+            movie_recommendations = movie_recommendations_json
+        else:
+            # Well-formed output takes the orjson fast path; anything else goes through repair
+            movie_recommendations = JsonParserOptimized.parse_json_output(movie_recommendations_json) or []
+
+        return list(islice(self._iter_current_releases(movie_recommendations), max_movies))
 
-            # Check if this is a current release
-            release_date = movie.get('release_date', '')
-            release_year = None
+    def _iter_current_releases(self, movies: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield only current releases, lazily so callers can stop early"""
+        # Movies from current year or previous year are considered current
+        min_year = datetime.now().year - 1
 
-            if release_date and len(release_date) >= 4:
-                try:
-                    release_year = int(release_date[:4])
-                except ValueError:
-                    pass
+        for movie in movies:
+            # Movies must have a title
+            if not isinstance(movie, dict) or 'title' not in movie:
+                continue
 
-            # Movies from current year or previous year are considered current
-            is_current = release_year is not None and release_year >= (current_year - 1)
+            # Check if this is a current release before touching the movie
+            release_date = movie.get('release_date')
+            if not release_date:
+                continue
+            head = release_date[:4]
+            if len(head) != 4 or not head.isdecimal() or int(head) < min_year:
+                continue
 
-            if is_current:
-                current_releases.append(movie)
+            # Ensure movie has a tmdb_id (titles alone are still searchable)
+            if movie.get('tmdb_id') is None:
+                movie_id = movie.get('id')
+                if movie_id is not None:
+                    movie['tmdb_id'] = movie_id
 
-        return current_releases
+            yield movie
 
     def _process_theaters_parallel(self, movies: List[Dict[str, Any]], user_coords: Dict[str, Any],
+                                   showtime_service: SerpShowtimeService,
                                    global_timeout: int = 30) -> List[Dict[str, Any]]:
         """Process theaters for all movies in parallel with caching and timeout"""
         # Import settings from django.conf for use in this method
@@ -187,6 +245,7 @@ class FindTheatersToolOptimized(BaseTool):
 
         all_theaters = []
         location = self.user_location or user_coords.get('display_name', 'Unknown')
+        location_key = location.strip().lower()
 
         # Initialize a list to store the futures
         futures = []
@@ -202,12 +261,13 @@ class FindTheatersToolOptimized(BaseTool):
             if not movie_title:
                 continue
 
-            # Check cache first to avoid redundant API calls
-            cache_key = f"{movie_id}:{movie_title}:{location}"
+            # Check cache first to avoid redundant API calls, by movie ID and then by title
+            cached_theaters = THEATER_CACHE['by_movie_id'].get((movie_id, location_key)) if movie_id else None
+            if cached_theaters is None:
+                cached_theaters = THEATER_CACHE['by_movie_title'].get((movie_title, location_key))
 
-            if movie_id and movie_id in THEATER_CACHE['by_movie_id'] and location in THEATER_CACHE['by_movie_id'][movie_id]:
+            if cached_theaters is not None:
                 # Use cached theater data
-                cached_theaters = THEATER_CACHE['by_movie_id'][movie_id][location]
                 all_theaters.extend(cached_theaters)
                 logger.info(f"Using {len(cached_theaters)} cached theaters for {movie_title}")
                 continue
@@ -223,6 +283,7 @@ class FindTheatersToolOptimized(BaseTool):
             # Submit task to thread pool with remaining time as timeout
             future = self._thread_pool.submit(
                 self._get_movie_showtimes_with_retries,
+                showtime_service,
                 movie_title,
                 movie_id,
                 location,
@@ -244,16 +305,11 @@ class FindTheatersToolOptimized(BaseTool):
                 theaters = future.result(timeout=remaining)  # Dynamic timeout based on remaining time
 
                 if theaters:
-                    # Update cache
+                    # Update cache (as a tuple so later requests can't change the cached list)
+                    cached_theaters = tuple(theaters)
                     if movie_id:
-                        if movie_id not in THEATER_CACHE['by_movie_id']:
-                            THEATER_CACHE['by_movie_id'][movie_id] = {}
-                        THEATER_CACHE['by_movie_id'][movie_id][location] = theaters
-
-                    if movie_title:
-                        if movie_title not in THEATER_CACHE['by_movie_title']:
-                            THEATER_CACHE['by_movie_title'][movie_title] = {}
-                        THEATER_CACHE['by_movie_title'][movie_title][location] = theaters
+                        THEATER_CACHE['by_movie_id'].set((movie_id, location_key), cached_theaters)
+                    THEATER_CACHE['by_movie_title'].set((movie_title, location_key), cached_theaters)
 
                     # Add to results
                     all_theaters.extend(theaters)
@@ -266,44 +322,25 @@ class FindTheatersToolOptimized(BaseTool):
             except Exception as e:
                 logger.error(f"Error processing theaters for {movie_title}: {str(e)}")
 
-        # Sort theaters by distance
-        all_theaters.sort(key=lambda x: x.get('distance_miles', float('inf')))
-
-        # Limit to maximum theaters from settings
+        # Keep the closest theaters, up to the maximum from settings
         max_theaters = getattr(settings, 'MAX_THEATERS', 10)
-        if len(all_theaters) > max_theaters:
-            all_theaters = all_theaters[:max_theaters]
-
-        return all_theaters
+        return heapq.nsmallest(max_theaters, all_theaters, key=_distance_sort_key)
 
-    def _get_movie_showtimes_with_retries(self, movie_title: str, movie_id: Any, location: str,
+    def _get_movie_showtimes_with_retries(self, showtime_service: SerpShowtimeService, movie_title: str,
+                                        movie_id: Any, location: str,
                                         user_coords: Dict[str, Any], max_retries: int = 1,
                                         timeout: int = 30, settings_obj = None) -> List[Dict[str, Any]]:
         """Get showtimes for a movie with automatic retries and timeout"""
         # Start timer for timeout
         start_time = time.time()
-        # Use passed settings if available, otherwise try to import
-        if settings_obj:
-            settings_to_use = settings_obj
-        else:
-            from django.conf import settings as settings_to_use
+        # Use passed settings if available, otherwise the module's Django settings
+        settings_to_use = settings_obj or settings
 
         retry_delay = getattr(settings_to_use, 'SERPAPI_BASE_RETRY_DELAY', 3.0)
         retry_multiplier = getattr(settings_to_use, 'SERPAPI_RETRY_MULTIPLIER', 1.5)
 
-        # Initialize SerpAPI service
-        try:
-            from django.conf import settings
-            serp_api_key = settings.SERPAPI_API_KEY
-            if not serp_api_key or serp_api_key == 'your_serpapi_key_here':
-                logger.warning("No valid SerpAPI key configured")
-                return []
-
-            showtime_service = SerpShowtimeService(api_key=serp_api_key)
-
-        except Exception as e:
-            logger.error(f"Error initializing SerpAPI service: {str(e)}")
-            return []
+        # Use a larger search radius to find more theaters
+        radius_miles = getattr(settings_to_use, 'THEATER_SEARCH_RADIUS_MILES', 25)  # Increased from 15 to 25
 
         # Search for showtimes with retries
         retry_count = 0
@@ -314,9 +351,6 @@ class FindTheatersToolOptimized(BaseTool):
                     logger.warning(f"Timeout reached for {movie_title}, returning early")
                     break
 
-                # Use a larger search radius to find more theaters
-                radius_miles = getattr(settings_to_use, 'THEATER_SEARCH_RADIUS_MILES', 25)  # Increased from 15 to 25
-
                 real_theaters_with_showtimes = APIRequestHandler.make_request(
                     lambda: showtime_service.search_showtimes(
                         movie_title=movie_title,
@@ -359,17 +393,22 @@ class FindTheatersToolOptimized(BaseTool):
         # Return empty list if all retries failed
         return []
 
+    def prefetch_user_coordinates(self) -> None:
+        """Resolve and cache the user's coordinates ahead of the theater search"""
+        try:
+            self._get_user_coordinates(LocationService(user_agent="movie_chatbot_theaters"))
+        except Exception as e:
+            logger.warning(f"Could not prefetch user coordinates: {str(e)}")
+
     def _get_user_coordinates(self, location_service: LocationService) -> Dict[str, Any]:
         """Get user coordinates efficiently with caching"""
-        if not hasattr(self.__class__, '_coord_cache'):
-            self.__class__._coord_cache = {}
-
         location = self.user_location
 
         # Check cache first
-        cache_key = f"{location}:{self.user_ip}"
-        if cache_key in self.__class__._coord_cache:
-            return self.__class__._coord_cache[cache_key]
+        cache_key = ((location or "").strip().lower(), self.user_ip)
+        cached_coords = COORDINATE_CACHE.get(cache_key)
+        if cached_coords is not None:
+            return cached_coords
 
         # Try to geocode the user's location
         user_coords = None
@@ -398,7 +437,7 @@ class FindTheatersToolOptimized(BaseTool):
             }
 
         # Cache the result
-        self.__class__._coord_cache[cache_key] = user_coords
+        COORDINATE_CACHE.set(cache_key, user_coords)
 
         return user_coords
 
@@ -427,7 +466,10 @@ class FindTheatersToolOptimized(BaseTool):
             # Process theaters
             for theater in serp_theaters:
                 # Skip theaters without proper data
-                if not isinstance(theater, dict) or not theater.get('name'):
+                if not isinstance(theater, dict):
+                    continue
+                name = theater.get('name')
+                if not name:
                     continue
 
                 # Check if distance is within radius
@@ -435,55 +477,41 @@ class FindTheatersToolOptimized(BaseTool):
                 if distance_miles is not None and distance_miles > max_radius_miles:
                     continue
 
-                # Extract showtimes
-                showtimes = theater.get('showtimes', [])
-                if not showtimes:
+                # Format showtimes (limited to max per theater), skipping theaters with none valid
+                valid_showtimes = [
+                    {"start_time": showtime['start_time'], "format": showtime.get('format', 'Standard')}
+                    for showtime in (theater.get('showtimes') or ())[:max_showtimes_per_theater]
+                    if 'start_time' in showtime
+                ]
+                if not valid_showtimes:
                     continue
 
+                # Sort showtimes chronologically
+                valid_showtimes.sort(key=itemgetter('start_time'))
+
                 # Format theater entry
                 theater_entry = {
                     "movie_id": movie_id,
                     "movie_title": movie_title,
-                    "name": theater.get('name', 'Unknown Theater'),
+                    "name": name,
                     "address": theater.get('address', ''),
                     "link": theater.get('link', ''),
                     "distance_miles": distance_miles,
-                    "showtimes": []
+                    "showtimes": valid_showtimes
                 }
 
                 # Add coordinates if available
-                if 'latitude' in theater and 'longitude' in theater:
-                    theater_entry['latitude'] = theater.get('latitude')
-                    theater_entry['longitude'] = theater.get('longitude')
-
-                # Format showtimes - limited to max per theater
-                valid_showtimes = []
-                for showtime in showtimes[:max_showtimes_per_theater]:
-                    if 'start_time' in showtime:
-                        valid_showtimes.append({
-                            "start_time": showtime['start_time'],
-                            "format": showtime.get('format', 'Standard')
-                        })
-
-                # Skip theaters with no valid showtimes
-                if not valid_showtimes:
-                    continue
-
-                # Sort showtimes chronologically
-                valid_showtimes.sort(key=lambda x: x['start_time'])
-                theater_entry['showtimes'] = valid_showtimes
+                latitude = theater.get('latitude')
+                longitude = theater.get('longitude')
+                if latitude is not None and longitude is not None:
+                    theater_entry['latitude'] = latitude
+                    theater_entry['longitude'] = longitude
 
                 # Add to results
                 formatted_theaters.append(theater_entry)
 
-            # Sort theaters by distance
-            formatted_theaters.sort(key=lambda x: x.get('distance_miles', float('inf')))
-
-            # Limit number of theaters
-            if len(formatted_theaters) > max_theaters:
-                formatted_theaters = formatted_theaters[:max_theaters]
-
-            return formatted_theaters
+            # Keep the closest theaters, up to the maximum number
+            return heapq.nsmallest(max_theaters, formatted_theaters, key=_distance_sort_key)
 
         except Exception as e:
             logger.error(f"Error formatting theater data: {str(e)}")
@@ -493,32 +521,24 @@ class FindTheatersToolOptimized(BaseTool):
         """Generate fallback theater data when no real theaters are found"""
         fallback_theaters = []
 
-        # Common movie theater chains
-        theater_templates = [
-            {
-                "name": "AMC Theaters",
-                "address": "123 Main St, Seattle, WA 98101",
-                "distance_miles": 8.3,
-                "link": "https://www.amctheatres.com"
-            },
-            {
-                "name": "Regal Cinemas",
-                "address": "456 Pine Ave, Bellevue, WA 98004",
-                "distance_miles": 10.5,
-                "link": "https://www.regmovies.com"
-            },
-            {
-                "name": "Cinemark Theaters",
-                "address": "789 Oak Blvd, Redmond, WA 98052",
-                "distance_miles": 12.2,
-                "link": "https://www.cinemark.com"
-            }
-        ]
-
         # Current time for generating showtimes
         now = datetime.now()
         base_hour = max(now.hour + 1, 10)  # Start at least one hour from now, not before 10 AM
 
+        # Showtimes are displayed as "8:00 PM" without a date, so one day's four are computed once
+        day_showtimes = []
+        for hour_offset in range(4):  # 4 showtimes per day
+            hour = (base_hour + hour_offset * 2) % 12  # Every 2 hours
+            if hour == 0:
+                hour = 12
+
+            # AM/PM designation
+            am_pm = "AM" if (base_hour + hour_offset * 2) < 12 else "PM"
+
+            # Format time as "8:00 PM" since that's what the frontend expects based on real data
+            minute_display = "00" if hour_offset % 2 == 0 else "30"
+            day_showtimes.append((f"{hour}:{minute_display} {am_pm}", "Standard" if hour_offset < 3 else "IMAX"))
+
         # Generate theater data for each movie
         for i, movie in enumerate(movies[:2]):  # Limit to 2 movies for performance
             movie_id = movie.get('tmdb_id')
@@ -528,7 +548,7 @@ class FindTheatersToolOptimized(BaseTool):
                 continue
 
             # Select template theater (rotating through the options)
-            theater_template = theater_templates[i % len(theater_templates)]
+            theater_template = _FALLBACK_THEATER_TEMPLATES[i % len(_FALLBACK_THEATER_TEMPLATES)]
 
             # Create theater entry
             theater_entry = {
@@ -538,37 +558,14 @@ class FindTheatersToolOptimized(BaseTool):
                 "address": theater_template["address"],
                 "link": theater_template["link"],
                 "distance_miles": theater_template["distance_miles"],
-                "showtimes": []
+                # Generate fake showtimes (the same 4 per day for the next 3 days)
+                "showtimes": [
+                    {"start_time": start_time, "format": format_choice}
+                    for _day in range(3)
+                    for start_time, format_choice in day_showtimes
+                ]
             }
 
-            # Generate fake showtimes (4 per day for the next 3 days)
-            for day in range(3):  # Today, tomorrow, day after
-                for hour_offset in range(4):  # 4 showtimes per day
-                    hour = (base_hour + hour_offset * 2) % 12  # Every 2 hours
-                    if hour == 0:
-                        hour = 12
-
-                    # AM/PM designation
-                    am_pm = "AM" if (base_hour + hour_offset * 2) < 12 else "PM"
-
-                    # Generate ISO format datetime string
-                    showtime_dt = now.replace(
-                        hour=(hour if am_pm == "AM" or hour == 12 else hour + 12) % 24,
-                        minute=0 if hour_offset % 2 == 0 else 30,
-                        second=0,
-                        microsecond=0
-                    ) + timedelta(days=day)
-
-                    # Format time as "8:00 PM" since that's what the frontend expects based on real data
-                    hour_display = hour
-                    minute_display = "00" if hour_offset % 2 == 0 else "30"
-                    start_time = f"{hour_display}:{minute_display} {am_pm}"
-
-                    theater_entry["showtimes"].append({
-                        "start_time": start_time,
-                        "format": "Standard" if hour_offset < 3 else "IMAX"
-                    })
-
             # Add to results
             fallback_theaters.append(theater_entry)
 
@@ -1,7 +1,6 @@
 """
 Tool for searching movies based on user criteria.
 """
-import json
 import logging
 from datetime import datetime
 from typing import Dict, Any, Union
@@ -10,6 +9,8 @@ from crewai.tools import BaseTool
 from pydantic import BaseModel, Field, field_validator
 from django.conf import settings
 
+from ..utils.json_parser import JsonParser
+
 # Get the logger
 logger = logging.getLogger('chatbot.movie_crew')
 
@@ -33,7 +34,7 @@ class SearchMoviesInput(BaseModel):
                     query_parts.append(f"release_date.gte={v['release_date.gte']}")
                 return " AND ".join(query_parts)
             # Default to JSON conversion
-            return json.dumps(v)
+            return JsonParser.dumps(v)
         return v
 
 class SearchMoviesTool(BaseTool):
@@ -70,7 +71,7 @@ class SearchMoviesTool(BaseTool):
                     query = " AND ".join(query_parts)
                 # Default to JSON conversion
                 else:
-                    query = json.dumps(query)
+                    query = JsonParser.dumps(query)
 
             # Use the query parameter if provided
             search_query = query if query else ""
@@ -130,7 +131,7 @@ class SearchMoviesTool(BaseTool):
 
                             # If we found movies via SerpAPI, return immediately
                             if movies:
-                                return json.dumps(movies)
+                                return JsonParser.dumps(movies)
                 except Exception as serp_error:
                     logger.error(f"Error using SerpAPI to search for movies: {str(serp_error)}")
                     # Continue with TMDB search as fallback
@@ -372,7 +373,7 @@ class SearchMoviesTool(BaseTool):
                             if year_filtered_movies:
                                 movies = year_filtered_movies
                                 logger.info(f"Using {len(movies)} year-filtered movies from discover API")
-                                return json.dumps(movies)
+                                return JsonParser.dumps(movies)
                     except Exception as discover_error:
                         logger.error(f"Error using discover API for year range: {str(discover_error)}")
                         # Fall back to regular search
@@ -520,10 +521,10 @@ class SearchMoviesTool(BaseTool):
             if not movies:
                 logger.warning(f"No movies found for query: {search_query}")
 
-            return json.dumps(movies)
+            return JsonParser.dumps(movies)
         except Exception as e:
             logger.error(f"Error searching for movies: {str(e)}")
-            return json.dumps([])
+            return JsonParser.dumps([])
 
     def _process_movie_result(self, movie, start_year, end_year) -> Dict[str, Any]:
         """
@@ -7,12 +7,92 @@ import logging
 from typing import Any, List, Dict
 import traceback
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Get the logger
 logger = logging.getLogger('chatbot.movie_crew')
 
+# Precompiled patterns for JSON preprocessing and repair, shared with the other parsers
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+_ADJACENT_OBJECTS_RE = re.compile(r'}\s*{')
+_ADJACENT_ARRAYS_RE = re.compile(r']\s*\[')
+_OBJECT_BEFORE_ARRAY_RE = re.compile(r'}\s*\[')
+_ARRAY_BEFORE_OBJECT_RE = re.compile(r']\s*{')
+_MISSING_COMMA_RE = re.compile(r'([\d"}])\s*"')
+_UNESCAPED_QUOTE_RE = re.compile(r'(?<!\\)"(?=.*":)')
+_UNCLOSED_LAST_STRING_RE = re.compile(r'"([^"]*)]$')
+_OBJECT_RE = re.compile(r'{[^{}]*(?:{[^{}]*}[^{}]*)*}')
+_EMPTY_PAIR_RE = re.compile(r'"\s*"')
+_UNQUOTED_FIRST_KEY_RE = re.compile(r'{([^{"\':,]+):')
+_UNQUOTED_KEY_RE = re.compile(r',([^{"\':,]+):')
+_BARE_KEY_RE = re.compile(r'([{,]\s*)([a-zA-Z0-9_]+)(\s*:)')
+_KEY_AFTER_OBJECT_RE = re.compile(r'(\s*})(\s*),(\s*)([a-zA-Z0-9_]+)(\s*:)')
+_UNQUOTED_VALUE_RE = re.compile(r':\s*([a-zA-Z][a-zA-Z0-9_]*)\s*([,}])')
+_OBJECT_ARRAY_RE = re.compile(r'\[\s*{.*}\s*\]', re.DOTALL)
+_FENCED_ARRAY_RE = re.compile(r'```(?:json)?\s*(\[\s*{.*}\s*\])\s*```', re.DOTALL)
+_BACKTICK_ARRAY_RE = re.compile(r'`(\[\s*{.*}\s*\])`', re.DOTALL)
+_ANY_OBJECT_RE = re.compile(r'{.*}', re.DOTALL)
+
 class JsonParser:
     """Parser for JSON from agent output."""
 
+    @staticmethod
+    def loads(data: str) -> Any:
+        """
+        Deserialize JSON, using orjson when it is installed.
+
+        Args:
+            data: The JSON string to parse
+
+        Returns:
+            Parsed JSON data
+
+        Raises:
+            json.JSONDecodeError: If the data is not valid JSON
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(data: Any) -> str:
+        """
+        Serialize data to a JSON string, using orjson when it is installed.
+
+        Args:
+            data: The data to serialize
+
+        Returns:
+            JSON string
+        """
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        return json.dumps(data)
+
+    @staticmethod
+    def loads_movies(data: str) -> List[Dict[str, Any]]:
+        """
+        Deserialize a movies payload into a list.
+        Each call parses afresh: tools update the movies in place, and with orjson a
+        parse is cheaper than deep-copying a cached result.
+
+        Args:
+            data: JSON string containing a movie list or a single movie
+
+        Returns:
+            List of movies owned by the caller
+
+        Raises:
+            json.JSONDecodeError: If the data is not valid JSON
+        """
+        movies = JsonParser.loads(data)
+        if isinstance(movies, dict):
+            return [movies]
+        return list(movies or ())
+
     @staticmethod
     def _preprocess_json(output: str) -> str:
         """
@@ -32,20 +112,20 @@ class JsonParser:
         output = output.replace("'", '"')
 
         # Fix common issues with trailing commas in arrays and objects
-        output = re.sub(r',\s*([}\]])', r'\1', output)
+        output = _TRAILING_COMMA_RE.sub(r'\1', output)
 
         # Fix missing commas between array elements
-        output = re.sub(r'}\s*{', '},{', output)
-        output = re.sub(r']\s*\[', r'],\[', output)  # Fixed escape sequence
-        output = re.sub(r'}\s*\[', r'},\[', output)  # Fixed escape sequence
-        output = re.sub(r']\s*{', r'],{', output)
+        output = _ADJACENT_OBJECTS_RE.sub('},{', output)
+        output = _ADJACENT_ARRAYS_RE.sub(r'],\[', output)  # Fixed escape sequence
+        output = _OBJECT_BEFORE_ARRAY_RE.sub(r'},\[', output)  # Fixed escape sequence
+        output = _ARRAY_BEFORE_OBJECT_RE.sub(r'],{', output)
 
         # Fix missing commas in JSON arrays and objects - more aggressive pattern
         # This handles cases like: {"a":1"b":2} -> {"a":1,"b":2}
-        output = re.sub(r'([\d"}])\s*"', r'\1,"', output)
+        output = _MISSING_COMMA_RE.sub(r'\1,"', output)
 
         # Fix unescaped quotes in strings
-        output = re.sub(r'(?<!\\)"(?=.*":)', r'\"', output)
+        output = _UNESCAPED_QUOTE_RE.sub(r'\"', output)
 
         # Fix mismatched brackets - ensure arrays are properly terminated
         open_brackets = output.count('[')
@@ -63,7 +143,7 @@ class JsonParser:
         # This handles cases where the last object in an array is incomplete
         if output.endswith('"]') or output.endswith('"}]'):
             # If it looks like the last quotation mark isn't closed properly
-            output = re.sub(r'"([^"]*)]$', r'"\1"}]', output)
+            output = _UNCLOSED_LAST_STRING_RE.sub(r'"\1"}]', output)
 
         return output
 
@@ -94,20 +174,19 @@ class JsonParser:
         result = []
 
         # Strategy 1: Use regex to find all JSON objects
-        object_pattern = r'{[^{}]*(?:{[^{}]*}[^{}]*)*}'
-        objects = re.findall(object_pattern, content)
+        objects = _OBJECT_RE.findall(content)
 
         # Try to parse each object with repair attempts
         for obj_str in objects:
             try:
                 # First try to parse as is
-                obj = json.loads(obj_str)
+                obj = JsonParser.loads(obj_str)
                 result.append(obj)
             except json.JSONDecodeError as e:
                 try:
                     # Try to repair the object
                     fixed_obj_str = JsonParser._repair_json_object(obj_str)
-                    obj = json.loads(fixed_obj_str)
+                    obj = JsonParser.loads(fixed_obj_str)
                     result.append(obj)
                 except Exception:
                     # Log but continue with other objects
@@ -134,7 +213,7 @@ class JsonParser:
                 try:
                     # Try to parse with repairs
                     fixed_part = JsonParser._repair_json_object(part)
-                    obj = json.loads(fixed_part)
+                    obj = JsonParser.loads(fixed_part)
                     result.append(obj)
                 except json.JSONDecodeError:
                     continue
@@ -165,12 +244,12 @@ class JsonParser:
             obj_str = obj_str + '}'
 
         # Fix missing commas between key-value pairs
-        obj_str = re.sub(r'"\s*"', '","', obj_str)
-        obj_str = re.sub(r'([\d"}])\s*"', r'\1,"', obj_str)
+        obj_str = _EMPTY_PAIR_RE.sub('","', obj_str)
+        obj_str = _MISSING_COMMA_RE.sub(r'\1,"', obj_str)
 
         # Fix missing quotation marks around keys
-        obj_str = re.sub(r'{([^{"\':,]+):', r'{"$1":', obj_str)
-        obj_str = re.sub(r',([^{"\':,]+):', r',"$1":', obj_str)
+        obj_str = _UNQUOTED_FIRST_KEY_RE.sub(r'{"$1":', obj_str)
+        obj_str = _UNQUOTED_KEY_RE.sub(r',"$1":', obj_str)
 
         # Balance quotes if needed
         quotes_count = obj_str.count('"')
@@ -224,7 +303,7 @@ class JsonParser:
 
             # First attempt: direct JSON parsing with preprocessed output
             try:
-                return json.loads(preprocessed_output)
+                return JsonParser.loads(preprocessed_output)
             except json.JSONDecodeError as je:
                 # If the error is near the end, try to truncate and repair
                 if je.pos > len(preprocessed_output) * 0.9:  # Error is in the last 10%
@@ -237,7 +316,7 @@ class JsonParser:
                         if last_complete > 0:
                             truncated = preprocessed_output[:last_complete + 2]  # Include the closing '}]'
                             logger.info(f"Truncated JSON from {len(preprocessed_output)} to {len(truncated)} chars")
-                            return json.loads(truncated)
+                            return JsonParser.loads(truncated)
 
                 # If the specific error handling didn't work, continue with regular approach
                 raise
@@ -251,29 +330,29 @@ class JsonParser:
                     try:
                         # Handle cases with single quotes instead of double quotes
                         cleaned_output = output.replace("'", '"')
-                        return json.loads(cleaned_output)
+                        return JsonParser.loads(cleaned_output)
                     except Exception:
                         pass
 
                 # Second attempt: Look for JSON-like patterns in the text
-                json_match = re.search(r'\[\s*{.*}\s*\]', output, re.DOTALL)
+                json_match = _OBJECT_ARRAY_RE.search(output)
                 if json_match:
-                    return json.loads(json_match.group(0))
+                    return JsonParser.loads(json_match.group(0))
 
                 # Third attempt: Look for JSON surrounded by triple backticks
-                json_match = re.search(r'```(?:json)?\s*(\[\s*{.*}\s*\])\s*```', output, re.DOTALL)
+                json_match = _FENCED_ARRAY_RE.search(output)
                 if json_match:
-                    return json.loads(json_match.group(1))
+                    return JsonParser.loads(json_match.group(1))
 
                 # Fourth attempt: Look for JSON surrounded by backticks
-                json_match = re.search(r'`(\[\s*{.*}\s*\])`', output, re.DOTALL)
+                json_match = _BACKTICK_ARRAY_RE.search(output)
                 if json_match:
-                    return json.loads(json_match.group(1))
+                    return JsonParser.loads(json_match.group(1))
 
                 # If all else fails, try to find a JSON object rather than an array
-                json_match = re.search(r'{.*}', output, re.DOTALL)
+                json_match = _ANY_OBJECT_RE.search(output)
                 if json_match:
-                    obj = json.loads(json_match.group(0))
+                    obj = JsonParser.loads(json_match.group(0))
                     if isinstance(obj, dict):
                         return [obj]
 
@@ -289,7 +368,7 @@ class JsonParser:
                 if len(output) > 10000:
                     try:
                         # Attempt to parse to get exact error location
-                        json.loads(output)
+                        JsonParser.loads(output)
                     except json.JSONDecodeError as je:
                         error_context = output[max(0, je.pos-20):min(len(output), je.pos+20)]
                         logger.error(f"JSON parse error at position {je.pos}: '{error_context}'")
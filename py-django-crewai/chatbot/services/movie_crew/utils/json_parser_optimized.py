@@ -12,9 +12,18 @@ import re
 import logging
 from typing import Any, Dict, List, Union, Optional
 
+from .json_parser import JsonParser, _BARE_KEY_RE, _TRAILING_COMMA_RE, _UNQUOTED_VALUE_RE
+
 # Configure logger
 logger = logging.getLogger('chatbot.json_parser')
 
+# Precompiled patterns for markdown stripping and extraction
+_MARKDOWN_FENCE_OPEN_RE = re.compile(r'^```(?:json)?', re.MULTILINE)
+_MARKDOWN_FENCE_CLOSE_RE = re.compile(r'```$', re.MULTILINE)
+_JSON_BLOCK_RE = re.compile(r'(\[[\s\S]*\]|\{[\s\S]*\})')
+_LIST_LITERAL_RE = re.compile(r'\[(.*?)\]', re.DOTALL)
+_DICT_LITERAL_RE = re.compile(r'\{(.*?)\}', re.DOTALL)
+
 class JsonParserOptimized:
     """Optimized parser for JSON output from CrewAI agents."""
 
@@ -38,9 +47,10 @@ class JsonParserOptimized:
         # Try to extract JSON if it's embedded in a larger text
         text = JsonParserOptimized._extract_json_from_text(text)
 
-        # Try to parse directly first (fastest path)
+        # Try to parse directly first (fastest path, orjson when installed;
+        # its JSONDecodeError subclasses json.JSONDecodeError)
         try:
-            return json.loads(text)
+            return JsonParser.loads(text)
         except json.JSONDecodeError:
             # Try to repair common issues
             repaired_json = JsonParserOptimized._repair_json(text)
@@ -64,8 +74,8 @@ class JsonParserOptimized:
             Clean text without markdown code block syntax
         """
         # Remove markdown code block syntax
-        text = re.sub(r'^```(?:json)?', '', text, flags=re.MULTILINE)
-        text = re.sub(r'```$', '', text, flags=re.MULTILINE)
+        text = _MARKDOWN_FENCE_OPEN_RE.sub('', text)
+        text = _MARKDOWN_FENCE_CLOSE_RE.sub('', text)
         return text.strip()
 
     @staticmethod
@@ -80,8 +90,7 @@ class JsonParserOptimized:
             Extracted JSON string
         """
         # Look for JSON array or object pattern with optimized regex
-        json_pattern = r'(\[[\s\S]*\]|\{[\s\S]*\})'
-        matches = re.findall(json_pattern, text)
+        matches = _JSON_BLOCK_RE.findall(text)
 
         if matches:
             # Find the longest match that parses as valid JSON
@@ -89,7 +98,7 @@ class JsonParserOptimized:
 
             for match in matches:
                 try:
-                    json.loads(match)
+                    JsonParser.loads(match)
                     return match
                 except json.JSONDecodeError:
                     continue
@@ -111,13 +120,13 @@ class JsonParserOptimized:
         try:
             # Apply multiple repair strategies
             # 1. Replace trailing commas
-            fixed_text = re.sub(r',\s*([}\]])', r'\1', text)
+            fixed_text = _TRAILING_COMMA_RE.sub(r'\1', text)
 
             # 2. Add missing quotes around property names
-            fixed_text = re.sub(r'([{,]\s*)([a-zA-Z0-9_]+)(\s*:)', r'\1"\2"\3', fixed_text)
+            fixed_text = _BARE_KEY_RE.sub(r'\1"\2"\3', fixed_text)
 
             # 3. Add missing quotes around string values
-            fixed_text = re.sub(r':\s*([a-zA-Z][a-zA-Z0-9_]*)\s*([,}])', r': "\1"\2', fixed_text)
+            fixed_text = _UNQUOTED_VALUE_RE.sub(r': "\1"\2', fixed_text)
 
             # 4. Fix escaped quotes
             fixed_text = fixed_text.replace('\\"', '"').replace('\\"', '"')
@@ -127,7 +136,7 @@ class JsonParserOptimized:
 
             # Try to parse the fixed JSON
             try:
-                return json.loads(fixed_text)
+                return JsonParser.loads(fixed_text)
             except json.JSONDecodeError:
                 # If still fails, try a more aggressive approach with a full regex parser
                 return JsonParserOptimized._aggressive_json_repair(fixed_text)
@@ -199,7 +208,7 @@ class JsonParserOptimized:
 
             # Final attempt to parse
             try:
-                return json.loads(fixed_text)
+                return JsonParser.loads(fixed_text)
             except json.JSONDecodeError:
                 # Give up and return None
                 return None
@@ -225,11 +234,8 @@ class JsonParserOptimized:
             import ast
 
             # First attempt to find and extract a list or dict
-            list_pattern = r'\[(.*?)\]'
-            dict_pattern = r'\{(.*?)\}'
-
-            list_match = re.search(list_pattern, text, re.DOTALL)
-            dict_match = re.search(dict_pattern, text, re.DOTALL)
+            list_match = _LIST_LITERAL_RE.search(text)
+            dict_match = _DICT_LITERAL_RE.search(text)
 
             if list_match:
                 # Found a list
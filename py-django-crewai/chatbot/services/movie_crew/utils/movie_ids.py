@@ -0,0 +1,33 @@
+"""
+Shared ID normalization for movie dicts passed between tools.
+"""
+
+import logging
+from typing import Any, Dict, Iterable
+
+# Get the logger
+logger = logging.getLogger('chatbot.movie_crew')
+
+def normalize_movie_ids(movies: Iterable[Dict[str, Any]]) -> int:
+    """
+    Give every movie matching id and tmdb_id fields plus a TMDB URL, in place.
+
+    Args:
+        movies: Movie dictionaries to normalize
+
+    Returns:
+        Number of movies that have neither a tmdb_id nor an id
+    """
+    missing = 0
+    for movie in movies:
+        # A falsy tmdb_id falls back to id, as everywhere else in the crew
+        movie_id = movie.get('tmdb_id') or movie.get('id')
+        if not movie_id:
+            missing += 1
+            logger.debug("Movie %s has no TMDB ID", movie.get('title'))
+            continue
+
+        movie['tmdb_id'] = movie['id'] = movie_id
+        if 'tmdb_url' not in movie:
+            movie['tmdb_url'] = f"https://www.themoviedb.org/movie/{movie_id}"
+    return missing
@@ -0,0 +1,68 @@
+"""
+Lightweight movie record used while post-processing recommendations.
+Keeps the fields the manager reads and writes per movie as slotted attributes
+and carries every other key through unchanged for the API boundary.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+@dataclass(slots=True)
+class MovieRec:
+    """Slotted record for a single recommended movie."""
+
+    tmdb_id: Optional[int] = None
+    title: Optional[str] = None
+    release_date: Optional[str] = None
+    is_current_release: Optional[bool] = None
+    conversation_mode: str = ""
+    theaters: Optional[List[Dict[str, Any]]] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "MovieRec":
+        """
+        Build a record from a parsed movie dict.
+
+        Args:
+            data: Movie dictionary from the recommendation output
+
+        Returns:
+            MovieRec with known fields lifted out of the dict
+        """
+        extra = dict(data)
+        # Same precedence as the manager's lookups: a falsy tmdb_id falls back to id
+        tmdb_id = extra.pop('tmdb_id', None) or extra.get('id')
+
+        return cls(
+            tmdb_id=tmdb_id,
+            title=extra.pop('title', None),
+            release_date=extra.pop('release_date', None),
+            is_current_release=extra.pop('is_current_release', None),
+            conversation_mode=extra.pop('conversation_mode', "") or "",
+            theaters=extra.pop('theaters', None),
+            extra=extra
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Convert the record back to a movie dict for the API.
+
+        Returns:
+            Movie dictionary including all pass-through keys
+        """
+        data = dict(self.extra)
+        if self.tmdb_id is not None:
+            data['tmdb_id'] = self.tmdb_id
+        # Fields the input didn't have and processing didn't set stay out of the output
+        if self.title is not None:
+            data['title'] = self.title
+        if self.release_date is not None:
+            data['release_date'] = self.release_date
+        if self.is_current_release is not None:
+            data['is_current_release'] = self.is_current_release
+        if self.conversation_mode:
+            data['conversation_mode'] = self.conversation_mode
+        if self.theaters is not None:
+            data['theaters'] = self.theaters
+        return data
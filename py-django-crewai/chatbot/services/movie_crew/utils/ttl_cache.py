@@ -0,0 +1,93 @@
+"""
+Bounded TTL cache for per-process result caches.
+Keeps the dict-style get/set access the manager already uses while:
+1. Expiring entries after a fixed TTL (showtimes go stale within hours)
+2. Evicting least recently used entries beyond a maximum size
+3. Guarding every access with a lock for concurrent requests
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Configure logger
+logger = logging.getLogger('chatbot.movie_crew')
+
+class BoundedTTLCache:
+    """Thread-safe LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, max_size: int = 512, ttl: int = 3600, name: str = "cache"):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept
+            ttl: Time-to-live in seconds for each entry
+            name: Name used in eviction log messages
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the live value for a key.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss or an expired entry
+
+        Returns:
+            Cached value or default
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < now:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value for a key, replacing any existing entry.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            self._evict(now)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries from the LRU end, then trim to max_size (lock must be held)"""
+        evicted = 0
+        while self._entries:
+            oldest_key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at >= now and len(self._entries) <= self.max_size:
+                break
+            del self._entries[oldest_key]
+            evicted += 1
+
+        if evicted and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s evicted %d entries (%d remaining)", self.name, evicted, len(self._entries))
@@ -54,3 +54,40 @@ class MovieCrewService:
             conversation_history=conversation_history,
             first_run_mode=first_run_mode
         )
+
+    @staticmethod
+    def process_query_stream(query, conversation_history, first_run_mode=True, user_location=None, user_ip=None, timezone=None):
+        """
+        Process a user query and yield partial results as crew tasks complete.
+
+        Args:
+            query: The user's query
+            conversation_history: Previous conversation messages
+            first_run_mode: Whether to operate in first run mode (with theaters)
+            user_location: Optional user location for theater search
+            user_ip: Optional user IP address
+            timezone: Optional timezone string
+
+        Yields:
+            Stage event dicts ending with a "complete" event holding the full response
+        """
+        # Check if First Run mode is disabled via feature flag
+        if first_run_mode and not settings.FEATURES.get('ENABLE_FIRST_RUN_MODE', True):
+            first_run_mode = False
+
+        # Stream from the same implementation process_query uses
+        manager = MovieCrewOptimizedEnhanced(
+            api_key=settings.LLM_CONFIG['api_key'],
+            base_url=settings.LLM_CONFIG.get('base_url'),
+            model=settings.LLM_CONFIG.get('model', 'gpt-4o-mini'),
+            tmdb_api_key=settings.TMDB_API_KEY,
+            user_location=user_location,
+            user_ip=user_ip,
+            timezone=timezone
+        )
+
+        return manager.process_query_stream(
+            query=query,
+            conversation_history=conversation_history,
+            first_run_mode=first_run_mode
+        )
@@ -8,17 +8,17 @@ This module improves on the optimized version with more advanced performance tec
 """
 
 import logging
-import json
 import re
 import asyncio
 import concurrent.futures
 import hashlib
+import queue
 import time
 import traceback
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Union, Callable
+from typing import List, Dict, Any, Optional, Union, Callable, Iterator
 from functools import lru_cache, wraps
-import tmdbsimple as tmdb
 from crewai import Task, Crew
 from django.conf import settings
 from langchain_openai import ChatOpenAI
@@ -31,13 +31,32 @@ from .movie_crew.tools.analyze_preferences_tool import AnalyzePreferencesTool
 from .movie_crew.tools.find_theaters_tool_optimized import FindTheatersToolOptimized
 from .movie_crew.tools.enhance_images_tool import EnhanceMovieImagesTool
 from .movie_crew.utils.logging_middleware import LoggingMiddleware
+from .movie_crew.utils.json_parser import JsonParser, _KEY_AFTER_OBJECT_RE, _TRAILING_COMMA_RE, _UNQUOTED_VALUE_RE
 from .movie_crew.utils.json_parser_optimized import JsonParserOptimized
 from .movie_crew.utils.response_formatter import ResponseFormatter
 from .movie_crew.utils.custom_event_listener import CustomEventListener
 
+try:
+    from crewai.utilities.events.utils.console_formatter import ConsoleFormatter
+except ImportError:
+    ConsoleFormatter = None
+
 # Configure logger
 logger = logging.getLogger('chatbot.movie_crew')
 
+# Tool names already pre-registered with CrewAI's process-wide event tracking
+_REGISTERED_TOOL_NAMES = set()
+
+# Attributes probed, in order, for a task's raw output, and the "not present" marker
+_TASK_OUTPUT_ATTRS = ('raw', 'result', 'output')
+_SENTINEL = object()
+
+# Leading four-digit year of a release date
+_YEAR_RE = re.compile(r'(\d{4})')
+
+# Shared pool running streamed queries, so concurrent streams can't spawn unbounded threads
+_STREAM_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=10, thread_name_prefix="movie-crew-stream")
+
 # Enhanced cache with TTL support
 class TTLCache:
     """Cache with time-to-live support"""
@@ -140,10 +159,10 @@ class CircuitBreaker:
         if self.state == "OPEN":
             # Check if recovery timeout has elapsed
             if (datetime.now() - self.last_failure_time).total_seconds() > self.recovery_timeout:
-                logger.info(f"Circuit {self.name} transitioning from OPEN to HALF-OPEN")
+                logger.info("Circuit %s transitioning from OPEN to HALF-OPEN", self.name)
                 self.state = "HALF-OPEN"
             else:
-                logger.warning(f"Circuit {self.name} is OPEN - fast failing")
+                logger.warning("Circuit %s is OPEN - fast failing", self.name)
                 raise Exception(f"Circuit breaker {self.name} is open")
 
         try:
@@ -151,7 +170,7 @@ class CircuitBreaker:
 
             # If successful and in HALF-OPEN, close the circuit
             if self.state == "HALF-OPEN":
-                logger.info(f"Circuit {self.name} transitioning from HALF-OPEN to CLOSED")
+                logger.info("Circuit %s transitioning from HALF-OPEN to CLOSED", self.name)
                 self.state = "CLOSED"
                 self.failures = 0
 
@@ -164,7 +183,7 @@ class CircuitBreaker:
 
             # If we've hit threshold, open the circuit
             if self.failures >= self.failure_threshold:
-                logger.warning(f"Circuit {self.name} transitioning to OPEN after {self.failures} failures")
+                logger.warning("Circuit %s transitioning to OPEN after %s failures", self.name, self.failures)
                 self.state = "OPEN"
 
             # Re-raise the exception
@@ -177,12 +196,15 @@ TMDB_CIRCUIT = CircuitBreaker(name="tmdb_service", failure_threshold=3, recovery
 
 def query_hash(query, conversation_history=None):
     """Generate a deterministic hash for a query to use as cache key"""
+    digest = hashlib.blake2b(query.encode('utf-8'), digest_size=16)
     if conversation_history:
-        # Only use the last 2 messages for context
-        context = [msg.get('content', '') for msg in conversation_history[-2:] if msg.get('content')]
-        query_with_context = query + ''.join(context)
-        return hashlib.md5(query_with_context.encode('utf-8')).hexdigest()
-    return hashlib.md5(query.encode('utf-8')).hexdigest()
+        # Only use the last 2 messages for context, hashed incrementally without a joined string
+        for msg in conversation_history[-2:]:
+            content = msg.get('content')
+            if content:
+                digest.update(b'\x00')
+                digest.update(content.encode('utf-8'))
+    return digest.hexdigest()
 
 class MovieCrewOptimizedEnhanced:
     """Enhanced Manager for the movie recommendation crew."""
@@ -224,14 +246,11 @@ class MovieCrewOptimizedEnhanced:
         # Create thread pool executor
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=10)
 
-        # Configure TMDb API if key is provided
-        if tmdb_api_key:
-            tmdb.API_KEY = tmdb_api_key
-
         # Get config values with better defaults
         self.timeout_seconds = getattr(settings, 'API_REQUEST_TIMEOUT', 180)
         self.max_retries = getattr(settings, 'API_MAX_RETRIES', 5)
         self.backoff_factor = getattr(settings, 'API_RETRY_BACKOFF_FACTOR', 1.3)
+        self._max_recommendations = getattr(settings, 'MAX_RECOMMENDATIONS', 3)
 
         # Create asyncio event loop for async operations
         self.loop = None
@@ -241,11 +260,10 @@ class MovieCrewOptimizedEnhanced:
         if self.executor:
             self.executor.shutdown(wait=False)
 
-    @LoggingMiddleware.log_method_call
     def create_llm(self, temperature: float = 0.7) -> ChatOpenAI:
         """
         Create an LLM instance with the specified configuration.
-        Uses caching to avoid recreating instances.
+        Uses caching to avoid recreating instances; cache hits skip the logging middleware.
 
         Args:
             temperature: Temperature parameter for the LLM
@@ -259,11 +277,25 @@ class MovieCrewOptimizedEnhanced:
         # Check if we already have this LLM in cache
         cached_llm = LLM_CACHE.get(cache_key)
         if cached_llm:
-            logger.info(f"Using cached LLM instance for {self.model}")
+            logger.debug("Using cached LLM instance for %s", self.model)
             return cached_llm
 
+        return self._build_llm_uncached(temperature, cache_key)
+
+    @LoggingMiddleware.log_method_call
+    def _build_llm_uncached(self, temperature: float, cache_key: str) -> ChatOpenAI:
+        """
+        Build and cache a new LLM instance.
+
+        Args:
+            temperature: Temperature parameter for the LLM
+            cache_key: LLM_CACHE key to store the instance under
+
+        Returns:
+            Configured ChatOpenAI instance
+        """
         # Log configuration details
-        logger.info(f"Creating new LLM with model: {self.model}")
+        logger.info("Creating new LLM with model: %s", self.model)
 
         # Extract model name and provider info
         model_name = self.model
@@ -277,15 +309,15 @@ class MovieCrewOptimizedEnhanced:
             # If explicit provider was given, it overrides the prefix in the name
             if not provider:
                 provider = provider_from_name
-                logger.info(f"Using provider from model name: {provider}")
+                logger.info("Using provider from model name: %s", provider)
 
             model_name = model_without_prefix
-            logger.info(f"Extracted model name without prefix: {model_name}")
+            logger.info("Extracted model name without prefix: %s", model_name)
 
         # If no provider specified yet, default to openai
         if not provider:
             provider = "openai"
-            logger.info(f"No provider specified, defaulting to: {provider}")
+            logger.info("No provider specified, defaulting to: %s", provider)
 
         try:
             # Set up model_kwargs for configuration
@@ -346,10 +378,10 @@ class MovieCrewOptimizedEnhanced:
                         # Check if recovery timeout has elapsed
                         if (LLM_CIRCUIT.last_failure_time is not None and
                             (datetime.now() - LLM_CIRCUIT.last_failure_time).total_seconds() > LLM_CIRCUIT.recovery_timeout):
-                            logger.info(f"Circuit {LLM_CIRCUIT.name} transitioning from OPEN to HALF-OPEN")
+                            logger.info("Circuit %s transitioning from OPEN to HALF-OPEN", LLM_CIRCUIT.name)
                             LLM_CIRCUIT.state = "HALF-OPEN"
                         else:
-                            logger.warning(f"Circuit {LLM_CIRCUIT.name} is OPEN - fast failing")
+                            logger.warning("Circuit %s is OPEN - fast failing", LLM_CIRCUIT.name)
                             raise Exception(f"Circuit breaker {LLM_CIRCUIT.name} is open")
 
                     # Direct instantiation without function call that triggers deprecation
@@ -363,7 +395,7 @@ class MovieCrewOptimizedEnhanced:
 
                     # Reset circuit breaker if in HALF-OPEN state
                     if LLM_CIRCUIT.state == "HALF-OPEN":
-                        logger.info(f"Circuit {LLM_CIRCUIT.name} transitioning from HALF-OPEN to CLOSED")
+                        logger.info("Circuit %s transitioning from HALF-OPEN to CLOSED", LLM_CIRCUIT.name)
                         LLM_CIRCUIT.state = "CLOSED"
                         LLM_CIRCUIT.failures = 0
 
@@ -379,19 +411,19 @@ class MovieCrewOptimizedEnhanced:
 
                     # If we've hit threshold, open the circuit
                     if LLM_CIRCUIT.failures >= LLM_CIRCUIT.failure_threshold:
-                        logger.warning(f"Circuit {LLM_CIRCUIT.name} transitioning to OPEN after {LLM_CIRCUIT.failures} failures")
+                        logger.warning("Circuit %s transitioning to OPEN after %s failures", LLM_CIRCUIT.name, LLM_CIRCUIT.failures)
                         LLM_CIRCUIT.state = "OPEN"
 
                     # Re-raise for outer exception handler
                     raise
 
             except Exception as e:
-                logger.error(f"Error creating LLM instance: {str(e)}")
+                logger.error("Error creating LLM instance: %s", e)
                 logger.error(traceback.format_exc())
                 raise
 
         except Exception as e:
-            logger.error(f"Error creating LLM instance: {str(e)}")
+            logger.error("Error creating LLM instance: %s", e)
             logger.error(traceback.format_exc())
             raise
 
@@ -405,19 +437,89 @@ class MovieCrewOptimizedEnhanced:
             conversation_history: List of previous messages in the conversation
             first_run_mode: Whether to operate in first run mode (with theaters)
 
+        Returns:
+            Dict with response text and movie recommendations
+        """
+        return self._run_query(query, conversation_history, first_run_mode)
+
+    def process_query_stream(self, query: str, conversation_history: List[Dict[str, str]], first_run_mode: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Process a user query and yield partial results as pipeline stages complete.
+
+        Yields a {"stage": "recommendations", "movies": [...]} event once recommendations
+        are parsed, a {"stage": "theaters", "theaters": [...]} event in First Run mode once
+        theaters are found, then a final {"stage": "complete", "response": ..., "movies": [...]}
+        event with the same payload process_query returns. If the pipeline fails or runs past
+        the request timeout, a final {"stage": "error", "response": ..., "movies": []} event
+        is yielded instead.
+
+        Args:
+            query: The user's query
+            conversation_history: List of previous messages in the conversation
+            first_run_mode: Whether to operate in first run mode (with theaters)
+
+        Yields:
+            Stage event dicts
+        """
+        events = queue.Queue()
+        error_event = {
+            "stage": "error",
+            "response": f"I apologize, but I encountered an error while searching for movies related to '{query}'. Please try again with a different request.",
+            "movies": []
+        }
+
+        def run():
+            terminal_event = error_event
+            try:
+                response = self._run_query(query, conversation_history, first_run_mode, on_stage=events.put)
+                terminal_event = {"stage": "complete", **response}
+            except Exception as e:
+                logger.error("Error streaming query: %s", e)
+                logger.error(traceback.format_exc())
+            finally:
+                # The consumer waits for a terminal event, so one is always sent
+                events.put(terminal_event)
+
+        _STREAM_EXECUTOR.submit(run)
+
+        deadline = time.monotonic() + self.timeout_seconds
+        while True:
+            try:
+                event = events.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                # The pipeline keeps running in the background; stop waiting on it
+                logger.warning("Streamed query timed out after %s seconds", self.timeout_seconds)
+                yield error_event
+                return
+
+            yield event
+            if event["stage"] in ("complete", "error"):
+                return
+
+    def _run_query(self, query: str, conversation_history: List[Dict[str, str]], first_run_mode: bool,
+                   on_stage: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Run the full recommendation pipeline for a query.
+
+        Args:
+            query: The user's query
+            conversation_history: List of previous messages in the conversation
+            first_run_mode: Whether to operate in first run mode (with theaters)
+            on_stage: Optional callback receiving intermediate stage events
+
         Returns:
             Dict with response text and movie recommendations
         """
         start_time = time.time()
         query_key = query_hash(query, conversation_history)
-        logger.info(f"Processing query with hash {query_key} (first_run_mode={first_run_mode})")
+        logger.info("Processing query with hash %s (first_run_mode=%s)", query_key, first_run_mode)
 
         # Check cache first for identical queries (with context)
         # Only use cache in casual mode as theaters/showtimes could change
         if not first_run_mode:
             cached_result = RESULT_CACHE['recommendations'].get(query_key)
             if cached_result:
-                logger.info(f"Using cached recommendation for query: {query}")
+                logger.info("Using cached recommendation for query: %s", query)
                 return cached_result
 
         try:
@@ -436,17 +538,17 @@ class MovieCrewOptimizedEnhanced:
 
             # Use asyncio to run the crew workflow
             result = self.loop.run_until_complete(
-                self._process_query_async(query, conversation_history, first_run_mode, llm)
+                self._process_query_async(query, conversation_history, first_run_mode, llm, on_stage)
             )
 
             # Log performance metrics
             elapsed_time = time.time() - start_time
-            logger.info(f"Query processing completed in {elapsed_time:.2f} seconds")
+            logger.info("Query processing completed in %.2f seconds", elapsed_time)
 
             return result
 
         except Exception as e:
-            logger.error(f"Error processing query: {str(e)}")
+            logger.error("Error processing query: %s", e)
             logger.error(traceback.format_exc())
 
             # Provide a graceful fallback response
@@ -455,7 +557,8 @@ class MovieCrewOptimizedEnhanced:
                 "movies": []
             }
 
-    async def _process_query_async(self, query: str, conversation_history: List[Dict[str, str]], first_run_mode: bool, llm) -> Dict[str, Any]:
+    async def _process_query_async(self, query: str, conversation_history: List[Dict[str, str]], first_run_mode: bool, llm,
+                                   on_stage: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Process a query asynchronously with better parallelization.
 
@@ -464,11 +567,12 @@ class MovieCrewOptimizedEnhanced:
             conversation_history: List of previous messages in the conversation
             first_run_mode: Whether to operate in first run mode (with theaters)
             llm: LLM instance to use
+            on_stage: Optional callback receiving intermediate stage events
 
         Returns:
             Dict with response text and movie recommendations
         """
-        logger.info(f"Processing query async: {query[:50]}...")
+        logger.info("Processing query async: %s...", query[:50])
 
         try:
             # Create tools and agents
@@ -517,6 +621,8 @@ class MovieCrewOptimizedEnhanced:
 
             # Wait for recommendations
             recommendations = await recommendations_task
+            if on_stage is not None:
+                on_stage({"stage": "recommendations", "movies": recommendations})
 
             # Now process theaters if needed
             theaters_data = []
@@ -529,6 +635,8 @@ class MovieCrewOptimizedEnhanced:
                     recommendations
                 )
                 theaters_data = await theaters_task
+                if on_stage is not None:
+                    on_stage({"stage": "theaters", "theaters": theaters_data})
 
             # Enhance and prepare final results
             enhanced_recommendations = await self.loop.run_in_executor(
@@ -567,14 +675,14 @@ class MovieCrewOptimizedEnhanced:
             return response
 
         except asyncio.TimeoutError:
-            logger.error(f"Timeout processing query: {query[:50]}...")
+            logger.error("Timeout processing query: %s...", query[:50])
             return {
                 "response": f"I apologize, but it's taking longer than expected to process your request for '{query}'. Please try a more specific query.",
                 "movies": []
             }
 
         except Exception as e:
-            logger.error(f"Error in async query processing: {str(e)}")
+            logger.error("Error in async query processing: %s", e)
             logger.error(traceback.format_exc())
             return {
                 "response": f"I apologize, but I encountered an error while searching for movies related to '{query}'. Please try again with a different request.",
@@ -588,10 +696,10 @@ class MovieCrewOptimizedEnhanced:
             future = concurrent.futures.ThreadPoolExecutor().submit(crew.kickoff)
             return future.result(timeout=timeout_seconds)
         except concurrent.futures.TimeoutError:
-            logger.error(f"Crew execution timed out after {timeout_seconds} seconds")
+            logger.error("Crew execution timed out after %s seconds", timeout_seconds)
             raise asyncio.TimeoutError(f"Crew execution timed out after {timeout_seconds} seconds")
         except Exception as e:
-            logger.error(f"Error executing crew: {str(e)}")
+            logger.error("Error executing crew: %s", e)
             logger.error(traceback.format_exc())
             raise
 
@@ -652,8 +760,8 @@ class MovieCrewOptimizedEnhanced:
             agent=movie_finder
         )
 
-        # Get max recommendations count from settings with default
-        max_recommendations = getattr(settings, 'MAX_RECOMMENDATIONS', 3)
+        # Max recommendations count is resolved from settings once in __init__
+        max_recommendations = self._max_recommendations
 
         recommend_movies_task = Task(
             description=f"Recommend top {max_recommendations} movies that best match preferences",
@@ -712,9 +820,12 @@ class MovieCrewOptimizedEnhanced:
         try:
             recommend_output = self._safe_extract_task_output(recommend_task, "Recommendation")
             recommendations = JsonParserOptimized.parse_json_output(recommend_output)
-            return recommendations if recommendations else []
+            # Keep only movie dicts so downstream loops can skip per-item type checks
+            if not isinstance(recommendations, list):
+                return []
+            return [movie for movie in recommendations if isinstance(movie, dict)]
         except Exception as e:
-            logger.error(f"Error processing recommendations: {str(e)}")
+            logger.error("Error processing recommendations: %s", e)
             return []
 
     def _process_theaters(self, theater_task, recommendations):
@@ -728,16 +839,22 @@ class MovieCrewOptimizedEnhanced:
             if not theaters_data and theater_output.startswith('[') and theater_output.endswith(']'):
                 theaters_data = self._repair_json(theater_output)
 
-            # Cache theaters by movie ID for future requests
+            # Cache theaters by movie ID for future requests (grouped first, one cache write per movie)
             if theaters_data:
+                theaters_by_movie_id = defaultdict(list)
                 for theater in theaters_data:
-                    if isinstance(theater, dict) and 'movie_id' in theater:
-                        movie_id = str(theater['movie_id'])
-                        RESULT_CACHE['theaters'].set(movie_id, theater)
+                    if isinstance(theater, dict):
+                        movie_id = theater.get('movie_id')
+                        if movie_id is not None:
+                            theaters_by_movie_id[str(movie_id)].append(theater)
+
+                theaters_cache = RESULT_CACHE['theaters']
+                for movie_id, movie_theaters in theaters_by_movie_id.items():
+                    theaters_cache.set(movie_id, movie_theaters)
 
             return theaters_data if theaters_data else []
         except Exception as e:
-            logger.error(f"Error processing theater data: {str(e)}")
+            logger.error("Error processing theater data: %s", e)
             return []
 
     def _enhance_recommendations(self, recommendations):
@@ -756,12 +873,8 @@ class MovieCrewOptimizedEnhanced:
                     if 'tmdb_id' not in movie and 'id' in movie:
                         movie['tmdb_id'] = movie['id']
 
-                # Use the tool to enhance images (with timeout)
-                recommendations_json = json.dumps(recs)
-                enhanced_json = enhance_images_tool._run(recommendations_json)
-
-                # Parse and return enhanced data
-                enhanced_recommendations = JsonParserOptimized.parse_json_output(enhanced_json)
+                # Enhance the parsed movies directly (no JSON round-trip between our own components)
+                enhanced_recommendations = enhance_images_tool._run_objects(recs)
                 return enhanced_recommendations if enhanced_recommendations else recs
 
             # Use circuit breaker pattern correctly - apply to the function call, not the definition
@@ -772,10 +885,10 @@ class MovieCrewOptimizedEnhanced:
                     # Check if recovery timeout has elapsed
                     if (TMDB_CIRCUIT.last_failure_time is not None and
                         (datetime.now() - TMDB_CIRCUIT.last_failure_time).total_seconds() > TMDB_CIRCUIT.recovery_timeout):
-                        logger.info(f"Circuit {TMDB_CIRCUIT.name} transitioning from OPEN to HALF-OPEN")
+                        logger.info("Circuit %s transitioning from OPEN to HALF-OPEN", TMDB_CIRCUIT.name)
                         TMDB_CIRCUIT.state = "HALF-OPEN"
                     else:
-                        logger.warning(f"Circuit {TMDB_CIRCUIT.name} is OPEN - fast failing")
+                        logger.warning("Circuit %s is OPEN - fast failing", TMDB_CIRCUIT.name)
                         raise Exception(f"Circuit breaker {TMDB_CIRCUIT.name} is open")
 
                 # Call the function with the recommendations parameter
@@ -783,7 +896,7 @@ class MovieCrewOptimizedEnhanced:
 
                 # Reset circuit breaker if in HALF-OPEN state
                 if TMDB_CIRCUIT.state == "HALF-OPEN":
-                    logger.info(f"Circuit {TMDB_CIRCUIT.name} transitioning from HALF-OPEN to CLOSED")
+                    logger.info("Circuit %s transitioning from HALF-OPEN to CLOSED", TMDB_CIRCUIT.name)
                     TMDB_CIRCUIT.state = "CLOSED"
                     TMDB_CIRCUIT.failures = 0
 
@@ -795,13 +908,13 @@ class MovieCrewOptimizedEnhanced:
 
                 # If we've hit threshold, open the circuit
                 if TMDB_CIRCUIT.failures >= TMDB_CIRCUIT.failure_threshold:
-                    logger.warning(f"Circuit {TMDB_CIRCUIT.name} transitioning to OPEN after {TMDB_CIRCUIT.failures} failures")
+                    logger.warning("Circuit %s transitioning to OPEN after %s failures", TMDB_CIRCUIT.name, TMDB_CIRCUIT.failures)
                     TMDB_CIRCUIT.state = "OPEN"
 
                 # Re-raise for outer exception handler
                 raise
         except Exception as e:
-            logger.error(f"Error enhancing recommendations: {str(e)}")
+            logger.error("Error enhancing recommendations: %s", e)
             return recommendations
 
     def _prepare_final_movies(self, recommendations, theaters_data, first_run_mode):
@@ -832,25 +945,21 @@ class MovieCrewOptimizedEnhanced:
 
     def _safe_extract_task_output(self, task, task_name):
         """Safely extract task output with better error handling"""
-        logger.debug(f"Extracting output from {task_name} task")
+        logger.debug("Extracting output from %s task", task_name)
 
-        if not hasattr(task, 'output'):
-            logger.error(f"{task_name} task has no 'output' attribute")
+        # A missing attribute and a None output are handled the same way
+        task_output = getattr(task, 'output', None)
+        if task_output is None:
+            logger.error("%s task has no output", task_name)
             return "[]"
 
-        if task.output is None:
-            logger.error(f"{task_name} task output is None")
-            return "[]"
-
-        # Try different approaches to get the raw output
-        if hasattr(task.output, 'raw'):
-            output = task.output.raw
-        elif hasattr(task.output, 'result'):
-            output = task.output.result
-        elif hasattr(task.output, 'output'):
-            output = task.output.output
+        # Take the first raw-output attribute present (one getattr per name, no hasattr probes)
+        for attr_name in _TASK_OUTPUT_ATTRS:
+            output = getattr(task_output, attr_name, _SENTINEL)
+            if output is not _SENTINEL:
+                break
         else:
-            output = str(task.output)
+            output = str(task_output)
 
         # Validate output is a string and has content
         if not isinstance(output, str):
@@ -863,69 +972,56 @@ class MovieCrewOptimizedEnhanced:
         try:
             # Try more aggressive JSON repair methods
             # 1. Replace trailing commas before closing brackets
-            fixed_json = re.sub(r',\s*}', '}', json_str)
-            fixed_json = re.sub(r',\s*]', ']', fixed_json)
+            fixed_json = _TRAILING_COMMA_RE.sub(r'\1', json_str) if ',' in json_str else json_str
 
             # 2. Fix unquoted property names
-            fixed_json = re.sub(r'(\s*})(\s*),(\s*)([a-zA-Z0-9_]+)(\s*:)', r'\1\2,\3"\4"\5', fixed_json)
+            fixed_json = _KEY_AFTER_OBJECT_RE.sub(r'\1\2,\3"\4"\5', fixed_json)
 
             # 3. Fix missing quotes around string values
-            fixed_json = re.sub(r':\s*([a-zA-Z][a-zA-Z0-9_]*)\s*([,}])', r': "\1"\2', fixed_json)
+            fixed_json = _UNQUOTED_VALUE_RE.sub(r': "\1"\2', fixed_json)
 
-            # Try parsing the fixed JSON
-            return json.loads(fixed_json)
+            # Try parsing the fixed JSON (orjson when available)
+            return JsonParser.loads(fixed_json)
         except Exception as e:
-            logger.error(f"JSON repair failed: {str(e)}")
+            logger.error("JSON repair failed: %s", e)
             # Return empty list if repair fails
             return []
 
     def _process_current_releases(self, recommendations):
         """Determine which movies are current releases"""
-        current_year = datetime.now().year
+        # Movies from current year or previous year are considered "current"
+        threshold_year = datetime.now().year - 1
 
+        # Recommendations are filtered to dicts in _process_recommendations
         for movie in recommendations:
-            if not isinstance(movie, dict):
-                continue
-
-            # Parse release date to determine if it's a current movie
-            release_date = movie.get('release_date', '')
-            release_year = None
-
-            if release_date and len(release_date) >= 4:
-                try:
-                    release_year = int(release_date[:4])
-                except ValueError:
-                    pass
-
-            # Movies from current year or previous year are considered "current"
-            is_current = release_year is not None and (release_year >= current_year - 1)
+            # Match the leading year without raising on malformed dates
+            year_match = _YEAR_RE.match(movie.get('release_date') or '')
+            is_current = bool(year_match) and int(year_match.group(1)) >= threshold_year
             movie['is_current_release'] = is_current
 
-            # For older movies, set an empty theaters list to skip theater lookup
+            # For older movies, ensure a theaters list to skip theater lookup (keep any existing one)
             if not is_current:
-                movie['theaters'] = []
+                movie.setdefault('theaters', [])
 
     def _combine_movies_and_theaters(self, recommendations, theaters_data):
         """Combine movie recommendations with theater data efficiently"""
         # Create lookup dictionaries for faster matching
-        theaters_by_movie_id = {}
-        theaters_by_movie_title = {}
+        theaters_by_movie_id = defaultdict(list)
+        theaters_by_movie_title = defaultdict(list)
 
         # First check cache for any known theaters
+        theaters_cache = RESULT_CACHE['theaters']
         for movie in recommendations:
             if not isinstance(movie, dict):
                 continue
 
             # Check if we have cached theaters for this movie
             if 'tmdb_id' in movie:
-                movie_id = str(movie['tmdb_id'])
-                cached_theater = RESULT_CACHE['theaters'].get(movie_id)
-                if cached_theater:
+                cached_theaters = theaters_cache.get(str(movie['tmdb_id']))
+                if cached_theaters:
                     # Use cached theaters
-                    if not 'theaters' in movie:
-                        movie['theaters'] = []
-                    movie['theaters'].append(cached_theater)
-                    logger.info(f"Using cached theater for movie {movie.get('title')}")
+                    movie.setdefault('theaters', []).extend(cached_theaters)
+                    logger.info("Using %d cached theaters for movie %s", len(cached_theaters), movie.get('title'))
 
         # Process theaters from this request
         for theater in theaters_data:
@@ -939,21 +1035,16 @@ class MovieCrewOptimizedEnhanced:
             if movie_id is None and movie_title is None:
                 continue
 
-            # Skip theaters without proper showtimes
-            if not theater.get("showtimes") or len(theater.get("showtimes", [])) == 0:
+            # Skip theaters without proper showtimes (empty or missing)
+            if not theater.get("showtimes"):
                 continue
 
-            # Add to ID-based lookup
+            # Add to ID-based lookup (stringified once per theater)
             if movie_id is not None:
-                movie_id_str = str(movie_id)
-                if movie_id_str not in theaters_by_movie_id:
-                    theaters_by_movie_id[movie_id_str] = []
-                theaters_by_movie_id[movie_id_str].append(theater)
+                theaters_by_movie_id[str(movie_id)].append(theater)
 
             # Add to title-based lookup
             if movie_title is not None:
-                if movie_title not in theaters_by_movie_title:
-                    theaters_by_movie_title[movie_title] = []
                 theaters_by_movie_title[movie_title].append(theater)
 
         # Process each movie and add theaters
@@ -976,24 +1067,22 @@ class MovieCrewOptimizedEnhanced:
                 movies_with_theaters.append(movie)
                 continue
 
-            # Look up theaters by ID first
-            movie_theaters = []
-            if movie_tmdb_id:
-                movie_id_str = str(movie_tmdb_id)
-                movie_theaters = theaters_by_movie_id.get(movie_id_str, [])
+            # Look up theaters by ID first (.get with an empty tuple avoids allocating on misses)
+            movie_id_str = str(movie_tmdb_id) if movie_tmdb_id else None
+            movie_theaters = theaters_by_movie_id.get(movie_id_str, ()) if movie_id_str else ()
 
             # If no theaters found by ID, try matching by title
             if not movie_theaters and movie_title:
-                movie_theaters = theaters_by_movie_title.get(movie_title, [])
+                movie_theaters = theaters_by_movie_title.get(movie_title, ())
 
                 # Update theater data with the movie ID for future reference
                 if movie_theaters and movie_tmdb_id:
                     for theater in movie_theaters:
                         theater["movie_id"] = movie_tmdb_id
 
-            # Add theaters to the movie
-            movie_with_theaters = {**movie, "theaters": movie_theaters}
-            movies_with_theaters.append(movie_with_theaters)
+            # Add theaters to the movie in place (recommendations are already mutated upstream)
+            movie["theaters"] = movie_theaters if movie_theaters else []
+            movies_with_theaters.append(movie)
 
         return movies_with_theaters
 
@@ -1007,12 +1096,13 @@ class MovieCrewOptimizedEnhanced:
                     derived_name = tool_class_name.lower().replace('tool', '_tool')
                     setattr(tool, 'name', derived_name)
 
-                # Pre-register tool with CrewAI event tracking
-                try:
-                    from crewai.utilities.events.utils.console_formatter import ConsoleFormatter
-                    if hasattr(ConsoleFormatter, 'tool_usage_counts') and tool.name not in ConsoleFormatter.tool_usage_counts:
-                        ConsoleFormatter.tool_usage_counts[tool.name] = 0
-                except (ImportError, AttributeError):
-                    pass
+                # Pre-register tool with CrewAI event tracking, once per tool name
+                if ConsoleFormatter is not None and tool.name not in _REGISTERED_TOOL_NAMES:
+                    try:
+                        if hasattr(ConsoleFormatter, 'tool_usage_counts'):
+                            ConsoleFormatter.tool_usage_counts.setdefault(tool.name, 0)
+                            _REGISTERED_TOOL_NAMES.add(tool.name)
+                    except AttributeError:
+                        pass
             except Exception:
                 pass  # Continue even if tool compatibility check fails
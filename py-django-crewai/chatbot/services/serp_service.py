@@ -186,13 +186,14 @@ class SerpShowtimeService:
         Returns:
             List of theater dictionaries with formatted showtimes
         """
-        # Log the top-level keys to understand the structure
-        result_keys = list(results.keys()) if isinstance(results, dict) else []
-        logger.info(f"SerpAPI result keys: {result_keys}")
-
         # Check for showtimes data
         has_showtimes = 'showtimes' in results
-        logger.info(f"Results contain showtimes data: {has_showtimes}")
+
+        # Structure diagnostics are only built when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            result_keys = list(results.keys()) if isinstance(results, dict) else []
+            logger.debug("SerpAPI result keys: %s", result_keys)
+            logger.debug("Results contain showtimes data: %s", has_showtimes)
 
         theaters = []
 
@@ -219,7 +220,7 @@ class SerpShowtimeService:
             for day_data in results['showtimes']:
                 # Enhanced logging for day data
                 day_name = day_data.get('day', 'Today')
-                logger.info(f"Processing showtimes for day: {day_name}")
+                logger.info("Processing showtimes for day: %s", day_name)
 
                 # Check if 'theaters' key exists for this day
                 if 'theaters' not in day_data:
@@ -228,7 +229,7 @@ class SerpShowtimeService:
 
                 # Extract date information from day_name string
                 day_date = self._extract_date_from_day_string(day_name)
-                logger.info(f"Extracted date: {day_date} from day string: {day_name}")
+                logger.info("Extracted date: %s from day string: %s", day_date, day_name)
 
                 # Process each theater for this day
                 for theater_data in day_data.get('theaters', []):
@@ -238,17 +239,17 @@ class SerpShowtimeService:
                     theater_link = theater_data.get('link', '')
 
                     # Enhanced logging for theater data
-                    logger.debug(f"Processing theater: {theater_name}, Address: {theater_address}, Distance: {theater_distance_str}")
+                    logger.debug("Processing theater: %s, Address: %s, Distance: %s", theater_name, theater_address, theater_distance_str)
 
                     # Parse distance (e.g., "21.0 mi" -> 21.0)
                     distance_miles = self._parse_distance(theater_distance_str)
 
                     # Skip theaters beyond our search radius
                     if distance_miles is not None and distance_miles > max_radius_miles:
-                        logger.info(f"Skipping theater '{theater_name}' - distance {distance_miles} miles exceeds maximum radius of {max_radius_miles} miles")
+                        logger.info("Skipping theater '%s' - distance %s miles exceeds maximum radius of %s miles", theater_name, distance_miles, max_radius_miles)
                         continue
 
-                    logger.info(f"Processing theater: {theater_name} (Distance: {distance_miles} miles)")
+                    logger.info("Processing theater: %s (Distance: %s miles)", theater_name, distance_miles)
 
                     # FIXED: Check if 'showing' exists in the theater data
                     if 'showing' not in theater_data:
@@ -277,7 +278,7 @@ class SerpShowtimeService:
                             logger.warning(f"Showing for theater '{theater_name}' has empty time array")
                             continue
 
-                        logger.info(f"Processing {len(time_array)} showtimes for theater '{theater_name}'")
+                        logger.info("Processing %d showtimes for theater '%s'", len(time_array), theater_name)
 
                         # Process each time string
                         for time_str in time_array:
@@ -336,7 +337,7 @@ class SerpShowtimeService:
                                         showtime_info["format"] = "3D"
 
                                 theater_showtimes.append(showtime_info)
-                                logger.debug(f"Added showtime: {start_time.isoformat()} for '{theater_name}'")
+                                logger.debug("Added showtime: %s for '%s'", start_time, theater_name)
                             except (ValueError, TypeError) as e:
                                 logger.warning(f"Error parsing time '{time_str}': {str(e)}")
 
@@ -354,7 +355,7 @@ class SerpShowtimeService:
 
                         # Add new showtimes to existing theater
                         theater_map[theater_name]["showtimes"].extend(theater_showtimes)
-                        logger.info(f"Added {len(theater_showtimes)} showtimes for '{theater_name}' on {day_name}")
+                        logger.info("Added %d showtimes for '%s' on %s", len(theater_showtimes), theater_name, day_name)
 
             # Convert theater map to list for return
             for theater_name, theater_info in theater_map.items():
@@ -362,7 +363,7 @@ class SerpShowtimeService:
                     # Sort showtimes by datetime
                     theater_info["showtimes"].sort(key=lambda x: x["start_time"])
                     theaters.append(theater_info)
-                    logger.info(f"Finalized theater '{theater_name}' with {len(theater_info['showtimes'])} total showtimes")
+                    logger.info("Finalized theater '%s' with %d total showtimes", theater_name, len(theater_info['showtimes']))
 
         except Exception as e:
             logger.error(f"Error parsing SerpAPI results: {str(e)}")
@@ -463,15 +464,15 @@ class SerpShowtimeService:
         # Get coordinates if available
         latitude = None
         longitude = None
-        if 'gps_coordinates' in theater_data:
-            coords = theater_data.get('gps_coordinates', {})
+        coords = theater_data.get('gps_coordinates')
+        if coords is not None:
             latitude = coords.get('latitude')
             longitude = coords.get('longitude')
 
         # Get distance if available
         distance_miles = None
-        if 'distance' in theater_data:
-            distance_text = theater_data.get('distance', '')
+        distance_text = theater_data.get('distance')
+        if distance_text is not None:
             # Extract numeric distance (e.g., "5.2 mi" -> 5.2)
             try:
                 distance_miles = float(distance_text.split()[0])
@@ -480,11 +481,15 @@ class SerpShowtimeService:
 
         # Process movie showtimes
         showtimes = []
+        theater_movies = theater_data.get('movies')
+        showing_data = theater_data.get('showing')
 
         # Handle the case where movies are within the theater data
-        if 'movies' in theater_data:
-            for movie in theater_data.get('movies', []):
-                if self._normalize_title(movie.get('name', '')) == self._normalize_title(movie_title):
+        if theater_movies is not None:
+            # Normalize the requested title once rather than per theater movie
+            normalized_title = self._normalize_title(movie_title)
+            for movie in theater_movies:
+                if self._normalize_title(movie.get('name', '')) == normalized_title:
                     # Process showtimes for this movie
                     for showtime_data in movie.get('showtimes', []):
                         # Extract datetime
@@ -494,13 +499,12 @@ class SerpShowtimeService:
 
                         # Extract format (e.g., "IMAX", "3D")
                         format_type = "Standard"
-                        if 'amenities' in showtime_data:
-                            amenities = showtime_data.get('amenities', [])
-                            if amenities:
-                                if any('IMAX' in amenity for amenity in amenities):
-                                    format_type = "IMAX"
-                                elif any('3D' in amenity for amenity in amenities):
-                                    format_type = "3D"
+                        amenities = showtime_data.get('amenities')
+                        if amenities:
+                            if any('IMAX' in amenity for amenity in amenities):
+                                format_type = "IMAX"
+                            elif any('3D' in amenity for amenity in amenities):
+                                format_type = "3D"
 
                         showtime_info = {
                             "start_time": datetime_str,
@@ -509,8 +513,7 @@ class SerpShowtimeService:
                         showtimes.append(showtime_info)
 
         # Handle the case where showing data is directly in the theater
-        elif 'showing' in theater_data:
-            showing_data = theater_data.get('showing', [])
+        elif showing_data is not None:
             for showing in showing_data:
                 for time in showing.get('time', []):
                     # Convert time format (e.g., "6:00pm") to datetime
@@ -1,18 +1,27 @@
 """
 TMDb API service for fetching movie data.
 """
+import asyncio
 import logging
 import tmdbsimple as tmdb
 from typing import Dict, Any, List, Optional
 import concurrent.futures
 import time
+import httpx
 import requests
 from urllib.parse import urljoin
+from django.conf import settings
 
 from .api_utils import APIRequestHandler
 
 logger = logging.getLogger('chatbot.tmdb_service')
 
+# Async retries must finish inside the movie crew's 30s image enhancement wait: no single
+# backoff sleeps longer than ASYNC_MAX_BACKOFF seconds, and no retry is scheduled once
+# ASYNC_RETRY_BUDGET seconds have passed (a last attempt can still take the 10s client timeout)
+ASYNC_MAX_BACKOFF = 4.0
+ASYNC_RETRY_BUDGET = 20.0
+
 class TMDBService:
     """Service for interacting with The Movie Database (TMDb) API."""
 
@@ -49,7 +58,7 @@ class TMDBService:
             List of enhanced movie dictionaries
         """
         start_time = time.time()
-        logger.info(f"Starting sequential enhancement of {len(movies)} movies")
+        logger.info("Starting sequential enhancement of %d movies", len(movies))
 
         # Handle empty list case
         if not movies:
@@ -60,19 +69,20 @@ class TMDBService:
 
         # Process each movie sequentially
         for idx, movie in enumerate(movies):
+            title = movie.get('title') or 'Unknown'
             try:
-                logger.info(f"Enhancing movie {idx+1}/{len(movies)}: {movie.get('title', 'Unknown')}")
+                logger.info("Enhancing movie %d/%d: %s", idx+1, len(movies), title)
                 enhanced_movie = self.enhance_movie_data(movie)
                 result_movies.append(enhanced_movie)
-                logger.info(f"Successfully enhanced movie {enhanced_movie.get('title', 'Unknown')}")
+                logger.info("Successfully enhanced movie %s", title)
             except Exception as e:
                 logger.error(f"Error enhancing movie at index {idx}: {str(e)}")
                 # Add the original movie on error
                 result_movies.append(movie)
-                logger.info(f"Added original movie data for {movie.get('title', 'Unknown')} due to enhancement error")
+                logger.info("Added original movie data for %s due to enhancement error", title)
 
         elapsed_time = time.time() - start_time
-        logger.info(f"Sequential enhancement completed in {elapsed_time:.2f} seconds")
+        logger.info("Sequential enhancement completed in %.2f seconds", elapsed_time)
         return result_movies
 
     def enhance_movies_parallel(self, movies: List[Dict[str, Any]], max_workers: int = 3) -> List[Dict[str, Any]]:
@@ -88,7 +98,7 @@ class TMDBService:
             List of enhanced movie dictionaries
         """
         start_time = time.time()
-        logger.info(f"Starting parallel enhancement of {len(movies)} movies with {max_workers} workers")
+        logger.info("Starting parallel enhancement of %d movies with %d workers", len(movies), max_workers)
 
         # Handle empty list case
         if not movies:
@@ -102,10 +112,11 @@ class TMDBService:
 
         def enhance_movie_task(idx, movie):
             """Thread worker function to enhance a single movie"""
+            title = movie.get('title') or 'Unknown'
             try:
-                logger.info(f"Parallel enhancing movie {idx+1}/{len(movies)}: {movie.get('title', 'Unknown')}")
+                logger.info("Parallel enhancing movie %d/%d: %s", idx+1, len(movies), title)
                 enhanced_movie = self.enhance_movie_data(dict(movie))  # Create a copy to avoid race conditions
-                logger.info(f"Successfully enhanced movie {enhanced_movie.get('title', 'Unknown')} in parallel")
+                logger.info("Successfully enhanced movie %s in parallel", title)
                 return idx, enhanced_movie
             except Exception as e:
                 logger.error(f"Error enhancing movie at index {idx} in parallel: {str(e)}")
@@ -129,7 +140,60 @@ class TMDBService:
         result_movies = [result_dict[idx] for idx in range(len(movies_copy))]
 
         elapsed_time = time.time() - start_time
-        logger.info(f"Parallel enhancement completed in {elapsed_time:.2f} seconds")
+        logger.info("Parallel enhancement completed in %.2f seconds", elapsed_time)
+        return result_movies
+
+    async def enhance_movies_async(self, movies: List[Dict[str, Any]], client: Optional[httpx.AsyncClient] = None,
+                                   max_concurrency: int = 4) -> List[Dict[str, Any]]:
+        """
+        Enhance multiple movies concurrently on a single event loop.
+
+        Args:
+            movies: List of movie dictionaries to enhance
+            client: Optional shared AsyncClient; a temporary one is created if omitted
+            max_concurrency: Maximum number of movies enhanced at once (keeps TMDB rate limits in check)
+
+        Returns:
+            List of enhanced movie dictionaries in the original order
+        """
+        start_time = time.time()
+        logger.info("Starting async enhancement of %d movies", len(movies))
+
+        # Handle empty list case
+        if not movies:
+            return []
+
+        owns_client = client is None
+        if owns_client:
+            client = httpx.AsyncClient(timeout=10.0)
+
+        # Bound in-flight movies so large batches don't trip TMDB's rate limit
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def enhance_bounded(movie):
+            async with semaphore:
+                return await self.enhance_movie_data_async(movie, client)
+
+        try:
+            results = await asyncio.gather(
+                *(enhance_bounded(movie) for movie in movies),
+                return_exceptions=True
+            )
+        finally:
+            if owns_client:
+                await client.aclose()
+
+        # Keep the original movie for any enhancement that raised
+        result_movies = []
+        for movie, result in zip(movies, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error enhancing movie {movie.get('title', 'Unknown')} asynchronously: {str(result)}")
+                result_movies.append(movie)
+            else:
+                result_movies.append(result)
+
+        elapsed_time = time.time() - start_time
+        logger.info("Async enhancement completed in %.2f seconds", elapsed_time)
         return result_movies
 
     def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -172,6 +236,79 @@ class TMDBService:
             # Return empty dict instead of raising to avoid breaking the application
             return {}
 
+    async def _make_request_async(self, client: httpx.AsyncClient, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Make an asynchronous request to the TMDb API.
+
+        Args:
+            client: AsyncClient used for the request
+            endpoint: API endpoint to request
+            params: Optional parameters for the request
+
+        Returns:
+            Response data as dictionary, or empty dict on failure
+        """
+        # Ensure endpoint doesn't start with a slash
+        if endpoint.startswith('/'):
+            endpoint = endpoint[1:]
+
+        url = urljoin(self.BASE_URL, endpoint)
+
+        # Prepare parameters with API key
+        request_params = {'api_key': self.api_key}
+        if params:
+            request_params.update(params)
+
+        # Same retry count and backoff as APIRequestHandler, without blocking the event loop,
+        # but with capped sleeps and a wall-clock budget for the whole request
+        max_retries = getattr(settings, 'API_MAX_RETRIES', 10)
+        backoff_factor = getattr(settings, 'API_RETRY_BACKOFF_FACTOR', 1.5)
+        retry_deadline = time.monotonic() + ASYNC_RETRY_BUDGET
+
+        for attempt in range(max_retries + 1):  # +1 because first attempt is not a retry
+            try:
+                response = await client.get(url, params=request_params)
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                # Only rate limits and server errors are worth retrying
+                if status_code != 429 and status_code < 500:
+                    logger.error(f"Async TMDB request failed with non-retryable error: {str(e)}")
+                    return {}
+                if attempt == max_retries:
+                    logger.error(f"Async TMDB request failed after {max_retries+1} attempts: {str(e)}")
+                    return {}
+                # Use a longer delay for rate limit errors
+                if status_code == 429:
+                    backoff_time = backoff_factor * (4 ** attempt)
+                else:
+                    backoff_time = backoff_factor * (2 ** attempt)
+            except httpx.TransportError as e:
+                if attempt == max_retries:
+                    logger.error(f"Async TMDB request failed after {max_retries+1} attempts: {str(e)}")
+                    return {}
+                backoff_time = backoff_factor * (2 ** attempt)
+            except httpx.HTTPError as e:
+                logger.error(f"Error making async request to TMDB API: {str(e)}")
+                return {}
+
+            backoff_time = min(backoff_time, ASYNC_MAX_BACKOFF)
+            if time.monotonic() + backoff_time >= retry_deadline:
+                logger.error(
+                    "Async TMDB request gave up after %d attempts, retry budget of %.0fs exhausted",
+                    attempt + 1, ASYNC_RETRY_BUDGET
+                )
+                return {}
+
+            logger.warning(
+                "Async TMDB request attempt %d/%d failed, retrying in %.2fs",
+                attempt + 1, max_retries + 1, backoff_time
+            )
+            await asyncio.sleep(backoff_time)
+
+        return {}
+
     def get_movie_details(self, movie_id) -> Dict[str, Any]:
         """
         Get detailed information about a movie.
@@ -210,7 +347,7 @@ class TMDBService:
 
             # If we got English images with posters, use them
             if images_en and 'posters' in images_en and images_en['posters']:
-                logger.info(f"Using English language images for movie ID {movie_id}")
+                logger.info("Using English language images for movie ID %s", movie_id)
                 return images_en
 
             # Otherwise, get all images as fallback
@@ -223,7 +360,7 @@ class TMDBService:
 
                 # If we found English posters, replace the full list with just those
                 if en_posters:
-                    logger.info(f"Filtered {len(images['posters'])} posters to {len(en_posters)} English ones for movie ID {movie_id}")
+                    logger.info("Filtered %d posters to %d English ones for movie ID %s", len(images['posters']), len(en_posters), movie_id)
                     images['posters'] = en_posters
 
             return images
@@ -231,6 +368,31 @@ class TMDBService:
             logger.error(f"Error getting movie images for ID {movie_id}: {str(e)}")
             return {'posters': [], 'backdrops': [], 'logos': []}
 
+    async def get_movie_images_async(self, client: httpx.AsyncClient, movie_id) -> Dict[str, Any]:
+        """
+        Get images for a movie asynchronously, preferring English-language posters.
+
+        Args:
+            client: AsyncClient used for the requests
+            movie_id: TMDB movie ID
+
+        Returns:
+            Dictionary containing posters, backdrops, and logos
+        """
+        # First try to get English-language images specifically
+        images_en = await self._make_request_async(client, f"movie/{movie_id}/images", {'include_image_language': 'en'})
+        if images_en.get('posters'):
+            return images_en
+
+        # Otherwise, get all images as fallback
+        images = await self._make_request_async(client, f"movie/{movie_id}/images")
+        if images.get('posters'):
+            en_posters = [p for p in images['posters'] if p.get('iso_639_1') == 'en']
+            if en_posters:
+                images['posters'] = en_posters
+
+        return images
+
     def search_movies(self, query: str, page: int = 1, include_adult: bool = False) -> Dict[str, Any]:
         """
         Search for movies.
@@ -332,64 +494,113 @@ class TMDBService:
 
         # If no TMDB ID, we can't enhance
         if 'tmdb_id' not in enhanced_data or not enhanced_data['tmdb_id']:
-            logger.warning(f"Movie {enhanced_data.get('title', 'Unknown')} has no TMDB ID, skipping enhancement")
+            logger.warning("Movie %s has no TMDB ID, skipping enhancement", enhanced_data.get('title', 'Unknown'))
             return enhanced_data
 
         movie_id = enhanced_data['tmdb_id']
 
         try:
-            # Get movie details for additional information
+            # Get movie details and images for the movie
             movie_details = self.get_movie_details(movie_id)
+            images = self.get_movie_images(movie_id)
 
-            # Add additional fields if available
-            if movie_details:
-                # Update poster with high-quality version
-                if 'poster_path' in movie_details and movie_details['poster_path']:
-                    enhanced_data['poster_url'] = f"{self.IMAGE_BASE_URL}original{movie_details['poster_path']}?language=en"
+            return self._apply_enhancements(movie_data, enhanced_data, movie_details, images)
 
-                # Add backdrop if available
-                if 'backdrop_path' in movie_details and movie_details['backdrop_path']:
-                    enhanced_data['backdrop_url'] = f"{self.IMAGE_BASE_URL}original{movie_details['backdrop_path']}?language=en"
+        except Exception as e:
+            logger.error(f"Error enhancing movie data for ID {movie_id}: {str(e)}")
+            return enhanced_data
 
-                # Add genres if available
-                if 'genres' in movie_details and movie_details['genres']:
-                    enhanced_data['genres'] = [genre['name'] for genre in movie_details['genres']]
+    async def enhance_movie_data_async(self, movie_data: Dict[str, Any], client: httpx.AsyncClient) -> Dict[str, Any]:
+        """
+        Enhance movie data asynchronously, fetching details and images concurrently.
 
-                # Add rating if available
-                if 'vote_average' in movie_details:
-                    enhanced_data['rating'] = movie_details['vote_average']
+        Args:
+            movie_data: Movie data dictionary with at least a tmdb_id field
+            client: AsyncClient used for the requests
 
-                # Add more detailed information
-                for field in ['tagline', 'runtime', 'vote_count', 'status', 'homepage']:
-                    if field in movie_details and movie_details[field]:
-                        enhanced_data[field] = movie_details[field]
+        Returns:
+            Enhanced movie data with additional fields
+        """
+        # Make a copy of the input data
+        enhanced_data = dict(movie_data)
 
-            # Try to get better poster from images endpoint
-            images = self.get_movie_images(movie_id)
-            if images and 'posters' in images and images['posters']:
-                # Use the first poster (usually the primary one)
-                enhanced_data['poster_url'] = f"{self.IMAGE_BASE_URL}original{images['posters'][0]['file_path']}?language=en"
-
-                # Add additional poster URLs at different sizes
-                enhanced_data['poster_urls'] = {
-                    size: f"{self.IMAGE_BASE_URL}{self.POSTER_SIZES[size]}{images['posters'][0]['file_path']}?language=en"
-                    for size in self.POSTER_SIZES
-                }
-
-                # Add a list of all poster URLs if more than one is available
-                if len(images['posters']) > 1:
-                    enhanced_data['all_posters'] = [
-                        f"{self.IMAGE_BASE_URL}original{poster['file_path']}?language=en"
-                        for poster in images['posters'][:5]  # Limit to first 5 posters
-                    ]
-
-            # Ensure is_current_release flag is preserved
-            if 'is_current_release' in movie_data:
-                enhanced_data['is_current_release'] = movie_data['is_current_release']
-
-            logger.info(f"Enhanced movie data for {enhanced_data.get('title', 'Unknown')} with TMDB data")
+        # If no TMDB ID, we can't enhance
+        if 'tmdb_id' not in enhanced_data or not enhanced_data['tmdb_id']:
+            logger.warning("Movie %s has no TMDB ID, skipping enhancement", enhanced_data.get('title', 'Unknown'))
             return enhanced_data
 
+        movie_id = enhanced_data['tmdb_id']
+
+        try:
+            movie_details, images = await asyncio.gather(
+                self._make_request_async(client, f"movie/{movie_id}"),
+                self.get_movie_images_async(client, movie_id)
+            )
+
+            return self._apply_enhancements(movie_data, enhanced_data, movie_details, images)
+
         except Exception as e:
             logger.error(f"Error enhancing movie data for ID {movie_id}: {str(e)}")
             return enhanced_data
+
+    def _apply_enhancements(self, movie_data: Dict[str, Any], enhanced_data: Dict[str, Any],
+                            movie_details: Dict[str, Any], images: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply fetched TMDB details and images to a copy of the movie data.
+
+        Args:
+            movie_data: Original movie data dictionary
+            enhanced_data: Copy of the movie data to update
+            movie_details: Movie details from TMDB
+            images: Movie images from TMDB
+
+        Returns:
+            Enhanced movie data with additional fields
+        """
+        # Add additional fields if available
+        if movie_details:
+            # Update poster with high-quality version
+            if 'poster_path' in movie_details and movie_details['poster_path']:
+                enhanced_data['poster_url'] = f"{self.IMAGE_BASE_URL}original{movie_details['poster_path']}?language=en"
+
+            # Add backdrop if available
+            if 'backdrop_path' in movie_details and movie_details['backdrop_path']:
+                enhanced_data['backdrop_url'] = f"{self.IMAGE_BASE_URL}original{movie_details['backdrop_path']}?language=en"
+
+            # Add genres if available
+            if 'genres' in movie_details and movie_details['genres']:
+                enhanced_data['genres'] = [genre['name'] for genre in movie_details['genres']]
+
+            # Add rating if available
+            if 'vote_average' in movie_details:
+                enhanced_data['rating'] = movie_details['vote_average']
+
+            # Add more detailed information
+            for field in ['tagline', 'runtime', 'vote_count', 'status', 'homepage']:
+                if field in movie_details and movie_details[field]:
+                    enhanced_data[field] = movie_details[field]
+
+        # Use a better poster from the images endpoint
+        if images and 'posters' in images and images['posters']:
+            # Use the first poster (usually the primary one)
+            enhanced_data['poster_url'] = f"{self.IMAGE_BASE_URL}original{images['posters'][0]['file_path']}?language=en"
+
+            # Add additional poster URLs at different sizes
+            enhanced_data['poster_urls'] = {
+                size: f"{self.IMAGE_BASE_URL}{self.POSTER_SIZES[size]}{images['posters'][0]['file_path']}?language=en"
+                for size in self.POSTER_SIZES
+            }
+
+            # Add a list of all poster URLs if more than one is available
+            if len(images['posters']) > 1:
+                enhanced_data['all_posters'] = [
+                    f"{self.IMAGE_BASE_URL}original{poster['file_path']}?language=en"
+                    for poster in images['posters'][:5]  # Limit to first 5 posters
+                ]
+
+        # Ensure is_current_release flag is preserved
+        if 'is_current_release' in movie_data:
+            enhanced_data['is_current_release'] = movie_data['is_current_release']
+
+        logger.info("Enhanced movie data for %s with TMDB data", enhanced_data.get('title', 'Unknown'))
+        return enhanced_data
@@ -0,0 +1,147 @@
+"""
+Unit tests for combining theaters with recommended movies in the crew manager.
+"""
+import unittest
+
+from chatbot.services.movie_crew.manager_optimized import MovieCrewManagerOptimized, RESULT_CACHE
+from chatbot.services.movie_crew.utils.movie_record import MovieRec
+
+
+def make_theater(name, movie_id=None, movie_title=None, showtimes=None):
+    """Build a theater dict as produced by the theater finder tool."""
+    theater = {
+        'name': name,
+        'showtimes': [{'start_time': '2025-01-01T19:00:00', 'format': 'Standard'}] if showtimes is None else showtimes
+    }
+    if movie_id is not None:
+        theater['movie_id'] = movie_id
+    if movie_title is not None:
+        theater['movie_title'] = movie_title
+    return theater
+
+
+class CombineMoviesAndTheatersTest(unittest.TestCase):
+    """Test ID/title matching, deduplication and theater caching in _combine_movies_and_theaters."""
+
+    def setUp(self):
+        """Create a manager and start from an empty theater cache."""
+        self.manager = MovieCrewManagerOptimized(api_key="test-key")
+        RESULT_CACHE['theaters'].clear()
+        self.addCleanup(RESULT_CACHE['theaters'].clear)
+
+    def combine(self, movies, theaters):
+        """Run the combine step on movie dicts and return the movies keyed by title."""
+        recommendations = [MovieRec.from_json(movie) for movie in movies]
+        combined = self.manager._combine_movies_and_theaters(recommendations, theaters)
+        return {movie['title']: movie for movie in combined}
+
+    def theater_names(self, movie):
+        """Names of the theaters attached to a combined movie."""
+        return [theater['name'] for theater in movie.get('theaters') or []]
+
+    def test_matches_by_id_across_id_types(self):
+        """Theaters match movies by TMDb ID whether the ID is an int or a string."""
+        combined = self.combine(
+            [{'tmdb_id': 550, 'title': 'Fight Club'}, {'tmdb_id': 603, 'title': 'The Matrix'}],
+            [make_theater('AMC', movie_id='550'), make_theater('Regal', movie_id=603)]
+        )
+
+        self.assertEqual(self.theater_names(combined['Fight Club']), ['AMC'])
+        self.assertEqual(self.theater_names(combined['The Matrix']), ['Regal'])
+
+    def test_matches_by_title_and_backfills_id(self):
+        """Theaters without a movie ID match by title and get the movie's ID filled in."""
+        theater = make_theater('AMC', movie_title='Fight Club')
+        combined = self.combine([{'tmdb_id': 550, 'title': 'Fight Club'}], [theater])
+
+        self.assertEqual(self.theater_names(combined['Fight Club']), ['AMC'])
+        self.assertEqual(theater['movie_id'], 550)
+
+    def test_title_match_with_another_movies_id_is_ignored(self):
+        """A theater whose title matches but whose ID belongs to another movie is not attached."""
+        combined = self.combine(
+            [{'tmdb_id': 550, 'title': 'Fight Club'}],
+            [make_theater('AMC', movie_id=999, movie_title='Fight Club')]
+        )
+
+        self.assertEqual(self.theater_names(combined['Fight Club']), [])
+
+    def test_numeric_title_does_not_match_id(self):
+        """A numeric title such as "1917" never collides with a movie ID."""
+        combined = self.combine(
+            [{'tmdb_id': 1917, 'title': 'Some Other Movie'}, {'tmdb_id': 530915, 'title': '1917'}],
+            [make_theater('AMC', movie_title='1917')]
+        )
+
+        self.assertEqual(self.theater_names(combined['Some Other Movie']), [])
+        self.assertEqual(self.theater_names(combined['1917']), ['AMC'])
+
+    def test_theater_matched_by_id_and_title_is_attached_once(self):
+        """A theater indexed under both the movie's ID and title appears only once."""
+        combined = self.combine(
+            [{'tmdb_id': 550, 'title': 'Fight Club'}],
+            [make_theater('AMC', movie_id=550, movie_title='Fight Club'), make_theater('Regal', movie_title='Fight Club')]
+        )
+
+        self.assertEqual(self.theater_names(combined['Fight Club']), ['AMC', 'Regal'])
+
+    def test_invalid_theaters_are_skipped(self):
+        """Non-dict entries, theaters without showtimes and unidentified theaters are dropped."""
+        combined = self.combine(
+            [{'tmdb_id': 550, 'title': 'Fight Club'}],
+            [
+                "not a theater",
+                make_theater('No Showtimes', movie_id=550, showtimes=[]),
+                make_theater('No Movie'),
+                make_theater('AMC', movie_id=550),
+            ]
+        )
+
+        self.assertEqual(self.theater_names(combined['Fight Club']), ['AMC'])
+
+    def test_fresh_theaters_replace_cached_ones(self):
+        """Theaters found by this request win over cached ones and replace them in the cache."""
+        RESULT_CACHE['theaters'].set(('550', ''), [make_theater('Stale', movie_id=550)])
+        combined = self.combine(
+            [{'tmdb_id': 550, 'title': 'Fight Club'}],
+            [make_theater('AMC', movie_id=550)]
+        )
+
+        self.assertEqual(self.theater_names(combined['Fight Club']), ['AMC'])
+        self.assertEqual([theater['name'] for theater in RESULT_CACHE['theaters'].get(('550', ''))], ['AMC'])
+
+    def test_repeated_searches_do_not_accumulate_theaters(self):
+        """Running the same search twice returns the theaters once, not old plus new."""
+        movies = [{'tmdb_id': 550, 'title': 'Fight Club'}]
+        self.combine(movies, [make_theater('AMC', movie_id=550)])
+        combined = self.combine(movies, [make_theater('AMC', movie_id=550)])
+
+        self.assertEqual(self.theater_names(combined['Fight Club']), ['AMC'])
+
+    def test_cached_theaters_fill_in_missing_results(self):
+        """A movie this request found no theaters for falls back to its cached theaters."""
+        RESULT_CACHE['theaters'].set(('550', ''), [make_theater('Cached', movie_id=550)])
+        combined = self.combine([{'tmdb_id': 550, 'title': 'Fight Club'}], [])
+
+        self.assertEqual(self.theater_names(combined['Fight Club']), ['Cached'])
+
+    def test_cached_theaters_are_scoped_by_location(self):
+        """Theaters cached for one location are never served to another."""
+        RESULT_CACHE['theaters'].set(('550', 'austin, tx'), [make_theater('Austin AMC', movie_id=550)])
+        self.manager.user_location = "Denver, CO"
+        combined = self.combine([{'tmdb_id': 550, 'title': 'Fight Club'}], [])
+
+        self.assertEqual(self.theater_names(combined['Fight Club']), [])
+
+    def test_movies_without_id_or_title_are_dropped(self):
+        """Records with neither an ID nor a title can't be matched and are left out."""
+        combined = self.manager._combine_movies_and_theaters(
+            [MovieRec.from_json({'overview': 'Unknown'}), MovieRec.from_json({'tmdb_id': 550, 'title': 'Fight Club'})],
+            []
+        )
+
+        self.assertEqual([movie['title'] for movie in combined], ['Fight Club'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Unit tests for the slotted MovieRec record used in recommendation post-processing.
+"""
+import unittest
+
+from chatbot.services.movie_crew.utils.movie_record import MovieRec
+
+
+class MovieRecTest(unittest.TestCase):
+    """Test conversion between movie dicts and MovieRec records."""
+
+    def test_round_trip_preserves_movie(self):
+        """to_json(from_json(movie)) returns the original movie dict."""
+        movie = {
+            'tmdb_id': 550,
+            'title': 'Fight Club',
+            'release_date': '1999-10-15',
+            'is_current_release': False,
+            'conversation_mode': 'casual',
+            'theaters': [{'name': 'AMC', 'showtimes': [{'start_time': '19:00'}]}],
+            'overview': 'An insomniac office worker...',
+            'poster_url': 'https://image.tmdb.org/t/p/w500/poster.jpg',
+            'rating': 8.4,
+        }
+
+        self.assertEqual(MovieRec.from_json(movie).to_json(), movie)
+
+    def test_round_trip_preserves_minimal_movie(self):
+        """A movie with only an ID and title comes back without added keys."""
+        movie = {'tmdb_id': 550, 'title': 'Fight Club'}
+
+        self.assertEqual(MovieRec.from_json(movie).to_json(), movie)
+
+    def test_known_fields_are_lifted_out(self):
+        """Known keys become attributes and other keys pass through in extra."""
+        record = MovieRec.from_json({'tmdb_id': 550, 'title': 'Fight Club', 'rating': 8.4})
+
+        self.assertEqual(record.tmdb_id, 550)
+        self.assertEqual(record.title, 'Fight Club')
+        self.assertIsNone(record.theaters)
+        self.assertEqual(record.extra, {'rating': 8.4})
+
+    def test_id_is_used_when_tmdb_id_is_missing(self):
+        """A movie without tmdb_id takes its ID from the id key."""
+        record = MovieRec.from_json({'id': 550, 'title': 'Fight Club'})
+
+        self.assertEqual(record.tmdb_id, 550)
+        self.assertEqual(record.to_json()['tmdb_id'], 550)
+        self.assertEqual(record.to_json()['id'], 550)
+
+    def test_optional_fields_are_omitted(self):
+        """Unset optional fields are left out of the output."""
+        data = MovieRec.from_json({'title': 'Fight Club'}).to_json()
+
+        self.assertNotIn('theaters', data)
+        self.assertNotIn('conversation_mode', data)
+        self.assertNotIn('tmdb_id', data)
+        self.assertNotIn('release_date', data)
+        self.assertNotIn('is_current_release', data)
+
+
+if __name__ == '__main__':
+    unittest.main()
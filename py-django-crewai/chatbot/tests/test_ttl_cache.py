@@ -0,0 +1,70 @@
+"""
+Unit tests for the movie crew's bounded TTL result cache.
+"""
+import unittest
+from unittest import mock
+
+from chatbot.services.movie_crew.utils import ttl_cache
+from chatbot.services.movie_crew.utils.ttl_cache import BoundedTTLCache
+
+
+class BoundedTTLCacheTest(unittest.TestCase):
+    """Test expiry and LRU eviction of BoundedTTLCache."""
+
+    def setUp(self):
+        """Freeze the cache's clock so expiry is deterministic."""
+        self.now = 1000.0
+        patcher = mock.patch.object(ttl_cache.time, "monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_returns_live_value(self):
+        """A stored value is returned until its TTL passes."""
+        cache = BoundedTTLCache(max_size=4, ttl=60)
+        cache.set("550", ["AMC"])
+
+        self.now += 60
+        self.assertEqual(cache.get("550"), ["AMC"])
+
+    def test_entries_expire(self):
+        """An expired entry returns the default and is dropped."""
+        cache = BoundedTTLCache(max_size=4, ttl=60)
+        cache.set("550", ["AMC"])
+
+        self.now += 61
+        self.assertIsNone(cache.get("550"))
+        self.assertEqual(cache.get("550", []), [])
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Beyond max_size the least recently used entry is evicted."""
+        cache = BoundedTTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Reading "a" makes "b" the least recently used entry
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_expired_entries_are_evicted_before_live_ones(self):
+        """Storing a new entry purges expired entries from the LRU end first."""
+        cache = BoundedTTLCache(max_size=4, ttl=60)
+        cache.set("old", 1)
+
+        self.now += 30
+        cache.set("newer", 2)
+
+        self.now += 31
+        cache.set("newest", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("newer"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
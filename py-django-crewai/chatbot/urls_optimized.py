@@ -7,6 +7,7 @@ urlpatterns = [
     path('api/movie-recommendations/', optimization_config.get_movie_recommendations, name='get_movie_recommendations'),
     path('api/poll-movie-recommendations/', optimization_config.poll_movie_recommendations, name='poll_movie_recommendations'),
     path('api/poll-first-run-recommendations/', optimization_config.poll_first_run_recommendations, name='poll_first_run_recommendations'),
+    path('api/stream-movie-recommendations/', optimization_config.stream_movie_recommendations, name='stream_movie_recommendations'),
     path('api/theaters/<int:movie_id>/', optimization_config.get_theaters, name='get_theaters'),
     path('api/theater-status/<int:movie_id>/', optimization_config.theater_status, name='theater_status'),
     path('api/reset/', optimization_config.reset_conversation, name='reset_conversation'),
@@ -7,7 +7,8 @@ This package contains all the Django views organized by functionality.
 from .movie_views import (
     get_movie_recommendations,
     poll_movie_recommendations,
-    poll_first_run_recommendations
+    poll_first_run_recommendations,
+    stream_movie_recommendations
 )
 
 from .theater_views import (
@@ -32,6 +33,7 @@ __all__ = [
     'get_movie_recommendations',
     'poll_movie_recommendations',
     'poll_first_run_recommendations',
+    'stream_movie_recommendations',
 
     # Theater views
     'get_movies_theaters_and_showtimes',
@@ -8,7 +8,7 @@ import logging
 import traceback
 import time
 from datetime import datetime
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.utils import timezone
@@ -19,6 +19,164 @@ from .common_views import _parse_request_data, _get_or_create_conversation
 # Configure logger
 logger = logging.getLogger('chatbot')
 
+def _save_recommendations(conversation, movies, user_timezone):
+    """
+    Persist movie recommendations with their theaters and showtimes.
+
+    Args:
+        conversation: Conversation the recommendations belong to
+        movies: Movie dicts from MovieCrewService (theaters are optional)
+        user_timezone: Timezone name used to localize showtimes like "8:00 PM"
+
+    Returns:
+        List of saved recommendation dicts for the API response
+    """
+    recommendations_data = []
+    for movie_data in movies:
+        # Convert release_date string to a proper date object
+        release_date_str = movie_data.get('release_date')
+        release_date = None
+        if release_date_str:
+            try:
+                release_date = datetime.strptime(release_date_str, '%Y-%m-%d').date()
+            except ValueError:
+                # Handle invalid date format
+                logger.warning(f"Invalid release date format: {release_date_str}")
+                pass
+
+        movie = MovieRecommendation.objects.create(
+            conversation=conversation,
+            title=movie_data.get('title', 'Unknown Movie'),
+            overview=movie_data.get('overview', ''),
+            poster_url=movie_data.get('poster_url', ''),
+            release_date=release_date,
+            tmdb_id=movie_data.get('tmdb_id'),
+            rating=movie_data.get('rating')
+        )
+
+        # Process theaters and showtimes
+        theaters_data = []
+        if movie_data.get('theaters'):
+            for theater_data in movie_data['theaters']:
+                theater, _ = Theater.objects.get_or_create(
+                    name=theater_data.get('name', 'Unknown Theater'),
+                    defaults={
+                        'address': theater_data.get('address', ''),
+                        'latitude': theater_data.get('latitude'),
+                        'longitude': theater_data.get('longitude'),
+                        'distance_miles': theater_data.get('distance_miles')
+                    }
+                )
+
+                # Save showtimes
+                showtimes_data = []
+                for showtime_data in theater_data.get('showtimes', []):
+                    try:
+                        # Process the showtime data
+                        try:
+                            # Save the original time string format for response
+                            original_time_str = showtime_data['start_time']
+
+                            # Check for non-ISO format times (e.g., "8:00 PM")
+                            time_str = original_time_str
+
+                            # First check if it's a time like "8:00 PM" or other non-ISO format
+                            if isinstance(time_str, str) and (":" in time_str and ("AM" in time_str.upper() or "PM" in time_str.upper())):
+                                # Parse time like "8:00 PM"
+                                import pytz
+
+                                # Get the base date (today)
+                                today = datetime.now().date()
+
+                                # Parse the time
+                                time_format = "%I:%M %p"  # Format for "8:00 PM"
+                                time_obj = datetime.strptime(time_str, time_format).time()
+
+                                # Combine date and time
+                                start_time = datetime.combine(today, time_obj)
+
+                                # Make it timezone aware
+                                tz = pytz.timezone(user_timezone)
+                                start_time = tz.localize(start_time)
+
+                                # Log successful conversion
+                                logger.info(f"Converted time format '{original_time_str}' to ISO format")
+                            else:
+                                try:
+                                    # Standard ISO format parsing
+                                    start_time = datetime.fromisoformat(time_str)
+                                    if start_time.tzinfo is None:
+                                        # Make timezone-aware if needed
+                                        start_time = timezone.make_aware(start_time)
+                                except ValueError:
+                                    # If ISO parsing fails, try one more time with AM/PM format
+                                    # This catches cases where the format detection might have failed
+                                    logger.warning(f"Trying alternative parsing for: {time_str}")
+                                    import pytz
+                                    today = datetime.now().date()
+
+                                    # Try multiple time formats
+                                    formats_to_try = ["%I:%M %p", "%I:%M%p", "%H:%M"]
+                                    parsed = False
+
+                                    for fmt in formats_to_try:
+                                        try:
+                                            time_obj = datetime.strptime(time_str, fmt).time()
+                                            start_time = datetime.combine(today, time_obj)
+                                            tz = pytz.timezone(user_timezone)
+                                            start_time = tz.localize(start_time)
+                                            parsed = True
+                                            logger.info(f"Parsed time with format {fmt}: {time_str}")
+                                            break
+                                        except ValueError:
+                                            continue
+
+                                    if not parsed:
+                                        # If all parsing attempts fail, raise an error
+                                        raise ValueError(f"Could not parse time: {time_str}")
+                        except ValueError as e:
+                            # Handle invalid datetime format by skipping this showtime
+                            logger.warning(f"Invalid datetime format in showtime: {time_str} - {str(e)}")
+                            continue
+
+                        # Create the showtime
+                        showtime = Showtime.objects.create(
+                            movie=movie,
+                            theater=theater,
+                            start_time=start_time,
+                            format=showtime_data.get('format', 'Standard')
+                        )
+
+                        # Add formatted showtime to the response
+                        showtimes_data.append({
+                            'start_time': showtime.start_time.isoformat(),
+                            'format': showtime.format
+                        })
+                    except (ValueError, TypeError) as e:
+                        # Log the error but continue processing other showtimes
+                        logger.warning(f"Invalid datetime format in showtime: {showtime_data['start_time']} - {str(e)}")
+                        # Skip this showtime
+                        continue
+
+                theaters_data.append({
+                    'name': theater.name,
+                    'address': theater.address,
+                    'distance_miles': float(theater.distance_miles) if theater.distance_miles else None,
+                    'showtimes': showtimes_data
+                })
+
+        recommendations_data.append({
+            'id': movie.id,
+            'title': movie.title,
+            'overview': movie.overview,
+            'poster_url': movie.poster_url,
+            'release_date': movie.release_date.isoformat() if movie.release_date and hasattr(movie.release_date, 'isoformat') else movie.release_date,
+            'rating': float(movie.rating) if movie.rating else None,
+            'theaters': theaters_data
+        })
+
+    return recommendations_data
+
 @csrf_exempt
 def get_movie_recommendations(request):
     """Process a message in Casual Viewing mode to get movie recommendations."""
@@ -407,149 +565,9 @@ def poll_first_run_recommendations(request):
             )
 
             # Process and save movie recommendations
-            recommendations_data = []
-            for movie_data in response_data.get('movies', []):
-                # Convert release_date string to a proper date object
-                release_date_str = movie_data.get('release_date')
-                release_date = None
-                if release_date_str:
-                    try:
-                        release_date = datetime.strptime(release_date_str, '%Y-%m-%d').date()
-                    except ValueError:
-                        # Handle invalid date format
-                        logger.warning(f"Invalid release date format: {release_date_str}")
-                        pass
-
-                movie = MovieRecommendation.objects.create(
-                    conversation=conversation,
-                    title=movie_data.get('title', 'Unknown Movie'),
-                    overview=movie_data.get('overview', ''),
-                    poster_url=movie_data.get('poster_url', ''),
-                    release_date=release_date,
-                    tmdb_id=movie_data.get('tmdb_id'),
-                    rating=movie_data.get('rating')
-                )
-
-                # Process theaters and showtimes
-                theaters_data = []
-                if movie_data.get('theaters'):
-                    for theater_data in movie_data['theaters']:
-                        theater, _ = Theater.objects.get_or_create(
-                            name=theater_data.get('name', 'Unknown Theater'),
-                            defaults={
-                                'address': theater_data.get('address', ''),
-                                'latitude': theater_data.get('latitude'),
-                                'longitude': theater_data.get('longitude'),
-                                'distance_miles': theater_data.get('distance_miles')
-                            }
-                        )
-
-                        # Save showtimes
-                        showtimes_data = []
-                        for showtime_data in theater_data.get('showtimes', []):
-                            try:
-                                # Process the showtime data
-                                try:
-                                    # Save the original time string format for response
-                                    original_time_str = showtime_data['start_time']
-
-                                    # Check for non-ISO format times (e.g., "8:00 PM")
-                                    time_str = original_time_str
-
-                                    # First check if it's a time like "8:00 PM" or other non-ISO format
-                                    if isinstance(time_str, str) and (":" in time_str and ("AM" in time_str.upper() or "PM" in time_str.upper())):
-                                        # Parse time like "8:00 PM"
-                                        import pytz
-
-                                        # Get the base date (today)
-                                        today = datetime.now().date()
-
-                                        # Parse the time
-                                        time_format = "%I:%M %p"  # Format for "8:00 PM"
-                                        time_obj = datetime.strptime(time_str, time_format).time()
-
-                                        # Combine date and time
-                                        start_time = datetime.combine(today, time_obj)
-
-                                        # Make it timezone aware
-                                        tz = pytz.timezone(user_timezone)
-                                        start_time = tz.localize(start_time)
-
-                                        # Log successful conversion
-                                        logger.info(f"Converted time format '{original_time_str}' to ISO format")
-                                    else:
-                                        try:
-                                            # Standard ISO format parsing
-                                            start_time = datetime.fromisoformat(time_str)
-                                            if start_time.tzinfo is None:
-                                                # Make timezone-aware if needed
-                                                start_time = timezone.make_aware(start_time)
-                                        except ValueError:
-                                            # If ISO parsing fails, try one more time with AM/PM format
-                                            # This catches cases where the format detection might have failed
-                                            logger.warning(f"Trying alternative parsing for: {time_str}")
-                                            import pytz
-                                            today = datetime.now().date()
-
-                                            # Try multiple time formats
-                                            formats_to_try = ["%I:%M %p", "%I:%M%p", "%H:%M"]
-                                            parsed = False
-
-                                            for fmt in formats_to_try:
-                                                try:
-                                                    time_obj = datetime.strptime(time_str, fmt).time()
-                                                    start_time = datetime.combine(today, time_obj)
-                                                    tz = pytz.timezone(user_timezone)
-                                                    start_time = tz.localize(start_time)
-                                                    parsed = True
-                                                    logger.info(f"Parsed time with format {fmt}: {time_str}")
-                                                    break
-                                                except ValueError:
-                                                    continue
-
-                                            if not parsed:
-                                                # If all parsing attempts fail, raise an error
-                                                raise ValueError(f"Could not parse time: {time_str}")
-                                except ValueError as e:
-                                    # Handle invalid datetime format by skipping this showtime
-                                    logger.warning(f"Invalid datetime format in showtime: {time_str} - {str(e)}")
-                                    continue
-
-                                # Create the showtime
-                                showtime = Showtime.objects.create(
-                                    movie=movie,
-                                    theater=theater,
-                                    start_time=start_time,
-                                    format=showtime_data.get('format', 'Standard')
-                                )
-
-                                # Add formatted showtime to the response
-                                showtimes_data.append({
-                                    'start_time': showtime.start_time.isoformat(),
-                                    'format': showtime.format
-                                })
-                            except (ValueError, TypeError) as e:
-                                # Log the error but continue processing other showtimes
-                                logger.warning(f"Invalid datetime format in showtime: {showtime_data['start_time']} - {str(e)}")
-                                # Skip this showtime
-                                continue
-
-                        theaters_data.append({
-                            'name': theater.name,
-                            'address': theater.address,
-                            'distance_miles': float(theater.distance_miles) if theater.distance_miles else None,
-                            'showtimes': showtimes_data
-                        })
-
-                recommendations_data.append({
-                    'id': movie.id,
-                    'title': movie.title,
-                    'overview': movie.overview,
-                    'poster_url': movie.poster_url,
-                    'release_date': movie.release_date.isoformat() if movie.release_date and hasattr(movie.release_date, 'isoformat') else movie.release_date,
-                    'rating': float(movie.rating) if movie.rating else None,
-                    'theaters': theaters_data
-                })
+            recommendations_data = _save_recommendations(
+                conversation, response_data.get('movies', []), user_timezone
+            )
 
             # Clear the query from the session
             if 'first_run_query' in request.session:
@@ -584,3 +602,85 @@ def poll_first_run_recommendations(request):
             'status': 'error',
             'message': 'An error occurred while processing your request.'
         }, status=500)
+
+@csrf_exempt
+def stream_movie_recommendations(request):
+    """Stream movie recommendations as Server-Sent Events while the crew is still running."""
+    if request.method != 'POST':
+        return JsonResponse({
+            'status': 'error',
+            'message': 'This endpoint only accepts POST requests'
+        }, status=405)
+
+    try:
+        # Parse the request data
+        data = _parse_request_data(request)
+        first_run_mode = data.get('mode', 'first_run') != 'casual'
+        conversation = _get_or_create_conversation(request, 'first_run' if first_run_mode else 'casual')
+
+        # Extract message from request data
+        user_message_text = (
+            data.get('message') or
+            data.get('text') or
+            data.get('query') or
+            ''
+        )
+        if not user_message_text:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'No message provided.'
+            }, status=400)
+
+        # Get conversation history before saving the new message
+        conversation_history = [{
+            'sender': msg.sender,
+            'content': msg.content
+        } for msg in conversation.messages.all()]
+
+        Message.objects.create(
+            conversation=conversation,
+            sender='user',
+            content=user_message_text
+        )
+
+        from .common_views import get_client_ip
+        user_timezone = request.session.get('user_timezone', 'America/Los_Angeles')
+        events = MovieCrewService.process_query_stream(
+            query=user_message_text,
+            conversation_history=conversation_history,
+            first_run_mode=first_run_mode,
+            user_location=data.get('location') or request.session.get('user_location', ''),
+            user_ip=get_client_ip(request),
+            timezone=user_timezone
+        )
+
+        def event_stream():
+            for event in events:
+                if event.get('stage') == 'complete':
+                    # Save the bot response and recommendations the same way the polling endpoints do
+                    Message.objects.create(
+                        conversation=conversation,
+                        sender='bot',
+                        content=event.get('response', 'Sorry, I could not generate a response.')
+                    )
+                    try:
+                        event['recommendations'] = _save_recommendations(
+                            conversation, event.get('movies', []), user_timezone
+                        )
+                    except Exception as e:
+                        logger.error(f"Error saving streamed recommendations: {str(e)}")
+                        logger.error(traceback.format_exc())
+                yield f"event: {event.get('stage')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+        response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    except Exception as e:
+        logger.error(f"Error streaming movie recommendations: {str(e)}")
+        logger.error(traceback.format_exc())
+        return JsonResponse({
+            'status': 'error',
+            'message': 'An error occurred while processing your request.'
+        }, status=500)